@@ -15,7 +15,7 @@ if errorlevel 1 (
 
 REM Install required packages
 echo Installing required packages...
-pip install pyinstaller matplotlib requests
+pip install pyinstaller matplotlib requests numpy urllib3
 
 REM Clean previous builds
 if exist "build" rmdir /s /q "build"
@@ -3,12 +3,22 @@ Bitaxe Gamma 601 API communication module
 Handles HTTP requests to the device's REST API
 """
 
-import requests
+import urllib3
+from urllib3.util.retry import Retry
 import json
 import logging
 import time
 from typing import Dict, Any, Optional, Tuple, List
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; fall back to the standard library
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj).encode('utf-8')
 
 class BitaxeAPI:
     def __init__(self, ip_address: str, port: int = 80, timeout: int = 10):
@@ -16,49 +26,129 @@ class BitaxeAPI:
         self.port = port
         self.timeout = timeout
         self.base_url = f"http://{ip_address}:{port}"
-        self.session = requests.Session()
+        self.pool = self._create_pool()
         self.last_share_count = 0
         self.lock = threading.Lock()
         
-        # Set session timeout
-        self.session.timeout = timeout
+        # Short-lived cache of GET responses so concurrent consumers share one request
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_ttl = 1.0
+        
+        # Worker pool for issuing independent endpoint requests concurrently;
+        # created on first use so callers that never need it don't own threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    # (standardized key, device key, default) for fields copied as-is from /api/system/status;
+    # hashrate is handled separately since it needs unit conversion
+    _STATUS_MAP = (
+        ('temperature', 'temp', 0),
+        ('chip_temperature', 'chipTemp', 0),
+        ('power', 'power', 0),
+        ('voltage', 'voltage', 0),
+        ('frequency', 'frequency', 0),
+        ('shares_accepted', 'sharesAccepted', 0),
+        ('shares_rejected', 'sharesRejected', 0),
+        ('uptime', 'uptimeSeconds', 0),
+        ('difficulty', 'difficulty', 0),
+        ('pool_url', 'stratumURL', ''),
+        ('worker_name', 'stratumUser', ''),
+        ('fan_speed', 'fanSpeed', 0),
+        ('asic_count', 'asicCount', 0),
+        ('efficiency', 'efficiency', 0),
+        ('best_diff', 'bestDiff', 0),
+        ('session_diff', 'sessionDiff', 0),
+    )
+    
+    # Default request headers; POSTs add a JSON content type
+    HEADERS = {"Connection": "keep-alive", "Accept": "application/json"}
+    POST_HEADERS = {**HEADERS, "Content-Type": "application/json"}
+    
+    def _create_pool(self) -> urllib3.HTTPConnectionPool:
+        """Create a keep-alive connection pool with retries for the current device address"""
+        retry = Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=[500, 502, 503, 504],
+            raise_on_status=False
+        )
+        return urllib3.HTTPConnectionPool(
+            host=self.ip_address,
+            port=self.port,
+            maxsize=8,
+            block=False,
+            retries=retry,
+            timeout=urllib3.Timeout(total=self.timeout)
+        )
+    
+    def _send(self, method: str, endpoint: str, data: Dict = None) -> urllib3.HTTPResponse:
+        """Send a request for an endpoint path on the device"""
+        if method == "POST":
+            body = _json_dumps(data) if data is not None else None
+            return self.pool.request(method, endpoint, body=body, headers=self.POST_HEADERS)
+        return self.pool.request(method, endpoint, headers=self.HEADERS)
         
-    def _make_request(self, endpoint: str, method: str = "GET", data: Dict = None) -> Tuple[bool, Any]:
+    def _make_request(self, endpoint: str, method: str = "GET", data: Dict = None,
+                      fresh: bool = False) -> Tuple[bool, Any]:
         """Make HTTP request to Bitaxe device"""
         try:
-            url = f"{self.base_url}{endpoint}"
+            method = method.upper()
+            if method not in ("GET", "POST"):
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            if method == "GET" and not fresh:
+                cached = self._cache.get(endpoint)
+                if cached and time.monotonic() - cached[0] < self._cache_ttl:
+                    return True, cached[1]
             
-            if method.upper() == "GET":
-                response = self.session.get(url, timeout=self.timeout)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, timeout=self.timeout)
+            response = self._send(method, endpoint, data)
+            if response.status >= 400:
+                logging.error(f"HTTP error from Bitaxe: {response.status} {response.reason}")
+                return False, f"HTTP error: {response.status} {response.reason}"
+            
+            # Logs come back as text, everything else as JSON; trust the declared type
+            body = response.data
+            if body and 'json' in response.headers.get('Content-Type', ''):
+                result = _json_loads(body)
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                result = body.decode('utf-8', errors='replace')
             
-            response.raise_for_status()
+            if method == "GET":
+                self._cache[endpoint] = (time.monotonic(), result)
+            else:
+                self._invalidate_cache("/api/system/")
             
-            # Try to parse JSON response
-            try:
-                return True, response.json()
-            except json.JSONDecodeError:
-                return True, response.text
+            return True, result
                 
-        except requests.exceptions.Timeout:
+        except urllib3.exceptions.MaxRetryError as e:
+            # NewConnectionError subclasses TimeoutError, so rule out refused connections first
+            if (isinstance(e.reason, urllib3.exceptions.TimeoutError) and
+                    not isinstance(e.reason, urllib3.exceptions.NewConnectionError)):
+                logging.error(f"Timeout connecting to Bitaxe at {self.ip_address}")
+                return False, "Connection timeout"
+            logging.error(f"Failed to connect to Bitaxe at {self.ip_address}")
+            return False, "Connection failed"
+        except urllib3.exceptions.NewConnectionError:
+            logging.error(f"Failed to connect to Bitaxe at {self.ip_address}")
+            return False, "Connection failed"
+        except urllib3.exceptions.TimeoutError:
             logging.error(f"Timeout connecting to Bitaxe at {self.ip_address}")
             return False, "Connection timeout"
-        except requests.exceptions.ConnectionError:
+        except urllib3.exceptions.HTTPError:
             logging.error(f"Failed to connect to Bitaxe at {self.ip_address}")
             return False, "Connection failed"
-        except requests.exceptions.HTTPError as e:
-            logging.error(f"HTTP error from Bitaxe: {e}")
-            return False, f"HTTP error: {e}"
         except Exception as e:
             logging.error(f"Unexpected error communicating with Bitaxe: {e}")
             return False, f"Unexpected error: {e}"
     
+    def _invalidate_cache(self, prefix: str = ""):
+        """Drop cached GET responses for endpoints under the given path prefix"""
+        for endpoint in list(self._cache):
+            if endpoint.startswith(prefix):
+                self._cache.pop(endpoint, None)
+    
     def test_connection(self) -> bool:
         """Test connection to Bitaxe device"""
-        success, _ = self._make_request("/api/system/info")
+        success, _ = self._make_request("/api/system/info", fresh=True)
         return success
     
     def get_system_info(self) -> Optional[Dict[str, Any]]:
@@ -68,39 +158,30 @@ class BitaxeAPI:
             return data
         return None
     
-    def get_mining_status(self) -> Optional[Dict[str, Any]]:
+    def get_current_settings(self) -> Optional[Dict[str, Any]]:
+        """Get the configured frequency (MHz) and core voltage (V) setpoints"""
+        info = self.get_system_info()
+        if not info:
+            return None
+        return {
+            'frequency': info.get('frequency', 0),
+            'voltage': info.get('coreVoltage', 0) / 1000  # reported in mV
+        }
+    
+    def get_mining_status(self, fresh: bool = False) -> Optional[Dict[str, Any]]:
         """Get current mining status and statistics"""
-        success, data = self._make_request("/api/system/status")
+        success, data = self._make_request("/api/system/status", fresh=fresh)
         if success and isinstance(data, dict):
             # Standardize the response format
-            standardized = {
-                'hashrate': data.get('hashRate', 0) / 1000000000,  # Convert to GH/s
-                'temperature': data.get('temp', 0),
-                'chip_temperature': data.get('chipTemp', 0),
-                'power': data.get('power', 0),
-                'voltage': data.get('voltage', 0),
-                'frequency': data.get('frequency', 0),
-                'shares_accepted': data.get('sharesAccepted', 0),
-                'shares_rejected': data.get('sharesRejected', 0),
-                'uptime': data.get('uptimeSeconds', 0),
-                'difficulty': data.get('difficulty', 0),
-                'pool_url': data.get('stratumURL', ''),
-                'worker_name': data.get('stratumUser', ''),
-                'fan_speed': data.get('fanSpeed', 0),
-                'asic_count': data.get('asicCount', 0),
-                'efficiency': data.get('efficiency', 0),
-                'best_diff': data.get('bestDiff', 0),
-                'session_diff': data.get('sessionDiff', 0)
-            }
+            get = data.get
+            standardized = {dst: get(src, default) for dst, src, default in self._STATUS_MAP}
+            hashrate = get('hashRate')
+            standardized['hashrate'] = hashrate / 1000000000 if hashrate else 0  # Convert to GH/s
             
-            # Check for new shares
-            with self.lock:
-                current_shares = standardized['shares_accepted']
-                if current_shares > self.last_share_count:
-                    standardized['new_share'] = True
-                    self.last_share_count = current_shares
-                else:
-                    standardized['new_share'] = False
+            # Check for new shares (a single attribute store is atomic, no lock needed)
+            current_shares = standardized['shares_accepted']
+            standardized['new_share'] = current_shares > self.last_share_count
+            self.last_share_count = current_shares
             
             return standardized
         return None
@@ -197,6 +278,26 @@ class BitaxeAPI:
             logging.error(f"Failed to apply settings: {response}")
             return False
     
+    def apply_and_measure(self, settings: Dict[str, Any], settle_ms: int = 30000,
+                          samples: int = 5, interval_ms: int = 1000) -> Optional[Dict[str, Any]]:
+        """Apply settings in one POST, let them settle, then sample mining status"""
+        before = self.get_mining_status(fresh=True)
+        if not self.apply_settings(settings):
+            return None
+        
+        time.sleep(settle_ms / 1000)
+        
+        # Samples are spread over the window; back-to-back reads would all see the same reading
+        results = []
+        for i in range(samples):
+            if i:
+                time.sleep(interval_ms / 1000)
+            status = self.get_mining_status(fresh=True)
+            if status:
+                results.append(status)
+        
+        return {'before': before, 'samples': results}
+    
     def get_performance_metrics(self) -> Optional[Dict[str, Any]]:
         """Get detailed performance metrics"""
         status = self.get_mining_status()
@@ -227,8 +328,41 @@ class BitaxeAPI:
         
         return metrics
     
+    def get_dashboard_data(self) -> Dict[str, Any]:
+        """Get performance metrics, pool and WiFi info in a single round-trip window"""
+        executor = self._get_executor()
+        metrics_future = executor.submit(self.get_performance_metrics)
+        pool_future = executor.submit(self.get_pool_info)
+        wifi_future = executor.submit(self.get_wifi_info)
+        
+        return {
+            'metrics': metrics_future.result(),
+            'pool': pool_future.result(),
+            'wifi': wifi_future.result()
+        }
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool, creating it on first use"""
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bitaxe-api")
+            return self._executor
+    
     def update_ip_address(self, new_ip: str):
         """Update the IP address for API communication"""
-        self.ip_address = new_ip
-        self.base_url = f"http://{new_ip}:{self.port}"
+        with self.lock:
+            old_pool = self.pool
+            self.ip_address = new_ip
+            self.base_url = f"http://{new_ip}:{self.port}"
+            self.pool = self._create_pool()
+            self._invalidate_cache()
+        old_pool.close()
         logging.info(f"Updated Bitaxe IP address to {new_ip}")
+    
+    def close(self):
+        """Release the connection pool and worker pool"""
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.pool.close()
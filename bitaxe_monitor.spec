@@ -15,6 +15,8 @@ a = Analysis(
         'matplotlib.backends.backend_tkagg',
         'PIL._tkinter_finder',
         'requests',
+        'urllib3',
+        'numpy',
         'sqlite3',
         'threading',
         'json',
@@ -5,13 +5,52 @@ Configuration management for Bitaxe Monitor
 import os
 import json
 import logging
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Callable, List
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 class Config:
+    # Delay before writing after set(), so bursts of edits produce one write
+    SAVE_DELAY = 0.5
+    
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
+        self._flat: Dict[str, Any] = {}
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        self._reload_listeners: List[Callable[['Config'], None]] = []
         self.settings = self.load_config()
     
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return self._settings
+    
+    @settings.setter
+    def settings(self, value: Dict[str, Any]):
+        self._settings = value
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Rebuild the dot-path lookup table from the settings tree"""
+        # Built aside and swapped in with one assignment: save_config runs this on the
+        # debounce timer thread, and get() must never see a partly filled table
+        flat: Dict[str, Any] = {}
+        self._index(self._settings, "", flat)
+        self._flat = flat
+    
+    def _index(self, node: Dict[str, Any], prefix: str, flat: Dict[str, Any]):
+        """Record every key under node in flat by its full dot path"""
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else key
+            flat[path] = value
+            if isinstance(value, dict):
+                self._index(value, path, flat)
+    
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default"""
         default_config = {
@@ -23,9 +62,12 @@ class Config:
             },
             "database": {
                 "file": "bitaxe_data.db",
-                "retention_days": 30
+                "retention_days": 30,
+                "flush_rows": 32,
+                "flush_interval": 2
             },
             "notifications": {
+                "daily_report": False,
                 "email": {
                     "enabled": False,
                     "smtp_server": "smtp.gmail.com",
@@ -33,6 +75,7 @@ class Config:
                     "sender_email": "",
                     "sender_password": "",
                     "recipient_email": "",
+                    "min_interval_sec": 300,
                     "alerts": {
                         "temperature_threshold": 85,
                         "hashrate_drop_percent": 20,
@@ -43,7 +86,9 @@ class Config:
             "optimization": {
                 "auto_optimize": False,
                 "target_temperature": 75,
-                "min_hashrate_improvement": 5
+                "min_hashrate_improvement": 5,
+                "search_strategy": "auto",
+                "max_trials": 15
             },
             "gui": {
                 "theme": "light",
@@ -54,8 +99,12 @@ class Config:
         
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
+                if orjson:
+                    with open(self.config_file, 'rb') as f:
+                        loaded_config = orjson.loads(f.read())
+                else:
+                    with open(self.config_file, 'r') as f:
+                        loaded_config = json.load(f)
                 # Merge with defaults to ensure all keys exist
                 return self._merge_configs(default_config, loaded_config)
             except Exception as e:
@@ -78,38 +127,102 @@ class Config:
         """Save configuration to file"""
         try:
             config_to_save = config if config else self.settings
-            with open(self.config_file, 'w') as f:
-                json.dump(config_to_save, f, indent=4)
+            if config_to_save is getattr(self, '_settings', None):
+                # Pick up any edits made directly on the settings dict
+                self._rebuild_index()
+            
+            # Write to a temp file and swap it in so a crash never leaves a partial config
+            tmp_file = f"{self.config_file}.tmp"
+            if orjson:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(config_to_save, option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(config_to_save, f, indent=4)
+            os.replace(tmp_file, self.config_file)
             logging.info(f"Configuration saved to {self.config_file}")
         except Exception as e:
             logging.error(f"Error saving config: {e}")
     
     def get(self, key_path: str, default=None):
         """Get configuration value using dot notation (e.g., 'bitaxe.ip_address')"""
-        keys = key_path.split('.')
-        value = self.settings
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value):
         """Set configuration value using dot notation"""
         keys = key_path.split('.')
         config = self.settings
+        path = ""
         
         for key in keys[:-1]:
+            path = f"{path}.{key}" if path else key
             if key not in config:
                 config[key] = {}
+                self._flat[path] = config[key]
             config = config[key]
         
         config[keys[-1]] = value
+        
+        # Drop entries under the replaced value, then index the new one
+        prefix = f"{key_path}."
+        for stale in [k for k in self._flat if k.startswith(prefix)]:
+            del self._flat[stale]
+        self._flat[key_path] = value
+        if isinstance(value, dict):
+            self._index(value, key_path, self._flat)
+        
+        self._schedule_save()
+        self._notify_reload()
+    
+    def on_reload(self, callback: Callable[['Config'], None]):
+        """Register callback(config), run after reload() or set() changes the settings"""
+        self._reload_listeners.append(callback)
+    
+    def off_reload(self, callback: Callable[['Config'], None]):
+        """Unregister a callback added with on_reload; unknown callbacks are ignored"""
+        try:
+            self._reload_listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def reload(self):
+        """Re-read the config file and notify reload listeners"""
+        self.settings = self.load_config()
+        self._notify_reload()
+    
+    def _notify_reload(self):
+        for callback in list(self._reload_listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"Error in config reload listener: {e}")
+    
+    def _schedule_save(self):
+        """Mark settings dirty and (re)start the debounce timer"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self._flush_if_dirty)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_if_dirty(self):
+        """Write settings to disk if there are unsaved changes"""
+        with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_timer = None
         self.save_config()
     
+    def flush(self):
+        """Write any pending changes immediately"""
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+        self._flush_if_dirty()
+    
     def get_email_config(self):
         """Get email configuration with environment variable fallbacks"""
         email_config = self.get('notifications.email', {})
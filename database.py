@@ -6,227 +6,630 @@ SQLite database for storing historical mining data
 import sqlite3
 import logging
 import datetime
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 import threading
+import queue
+from concurrent.futures import Future
+from pathlib import Path
+import numpy as np
 
 class Database:
-    def __init__(self, db_file="bitaxe_data.db"):
+    # Connection tuning: WAL lets readers run alongside the writer and
+    # synchronous=NORMAL only fsyncs at checkpoints
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    )
+    
+    # Read-only connections share the file's journal mode; only tune their caches
+    READER_PRAGMAS = (
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    )
+    
+    # High-frequency inserts are committed in batches instead of one fsync per row
+    COMMIT_EVERY = 10
+    COMMIT_INTERVAL = 2.0
+    
+    # Mining rows are staged in memory and written with executemany; high-frequency
+    # polling can widen the window (database.flush_interval) so the disk sees one bulk
+    # insert per interval. Reads don't force a flush, so staged rows become visible
+    # to them when the window closes or the buffer fills, or after flush()
+    MINING_FLUSH_ROWS = 32
+    MINING_FLUSH_INTERVAL = 2.0
+    
+    # Format SQLite uses for CURRENT_TIMESTAMP (UTC)
+    TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+    
+    # SQL statements, hoisted so each call only binds parameters
+    SQL_SCHEMA = '''
+        -- Mining data table
+        CREATE TABLE IF NOT EXISTS mining_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            hashrate REAL,
+            temperature REAL,
+            power REAL,
+            voltage REAL,
+            frequency INTEGER,
+            difficulty REAL,
+            shares_accepted INTEGER,
+            shares_rejected INTEGER,
+            uptime INTEGER,
+            fan_speed INTEGER,
+            chip_temperature REAL,
+            pool_url TEXT,
+            worker_name TEXT
+        );
+        
+        -- Settings optimization history
+        CREATE TABLE IF NOT EXISTS optimization_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            frequency INTEGER,
+            voltage REAL,
+            hashrate_before REAL,
+            hashrate_after REAL,
+            temperature_before REAL,
+            temperature_after REAL,
+            improvement_percent REAL,
+            success BOOLEAN
+        );
+        
+        -- Optimizer test results per device and setting, reused until they age out or the firmware changes
+        CREATE TABLE IF NOT EXISTS optimization_cache (
+            device TEXT,
+            frequency INTEGER,
+            voltage REAL,
+            firmware TEXT,
+            hashrate REAL,
+            temperature REAL,
+            stability REAL,
+            ts REAL,
+            PRIMARY KEY (device, frequency, voltage)
+        );
+        
+        -- Share submissions
+        CREATE TABLE IF NOT EXISTS share_submissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            share_type TEXT,
+            difficulty REAL,
+            accepted BOOLEAN,
+            response_time REAL
+        );
+        
+        -- Alerts and notifications
+        CREATE TABLE IF NOT EXISTS alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            alert_type TEXT,
+            message TEXT,
+            severity TEXT,
+            acknowledged BOOLEAN DEFAULT FALSE
+        );
+        
+        -- Indexes for the time-window queries; the chart index covers
+        -- every column get_chart_data reads so it never touches the table
+        CREATE INDEX IF NOT EXISTS idx_mining_ts ON mining_data(timestamp DESC);
+        CREATE INDEX IF NOT EXISTS idx_mining_chart
+            ON mining_data(timestamp, hashrate, temperature, power);
+        CREATE INDEX IF NOT EXISTS idx_share_ts ON share_submissions(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_alerts_ack_ts ON alerts(acknowledged, timestamp DESC);
+    '''
+    
+    SQL_INSERT_MINING = '''
+        INSERT INTO mining_data (
+            timestamp, hashrate, temperature, power, voltage, frequency,
+            difficulty, shares_accepted, shares_rejected, uptime,
+            fan_speed, chip_temperature, pool_url, worker_name
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    SQL_RECENT = '''
+        SELECT * FROM mining_data
+        WHERE timestamp > ?
+        ORDER BY timestamp DESC
+    '''
+    
+    SQL_CHART = '''
+        SELECT timestamp, IFNULL(hashrate, 0), IFNULL(temperature, 0), IFNULL(power, 0)
+        FROM mining_data
+        WHERE timestamp > ?
+        ORDER BY timestamp
+    '''
+    
+    SQL_DAILY_STATS = '''
+        SELECT
+            AVG(hashrate), AVG(temperature), AVG(power),
+            MAX(temperature), MIN(hashrate), MAX(hashrate), MAX(uptime)
+        FROM mining_data
+        WHERE timestamp > ?
+    '''
+    
+    SQL_AVERAGE_STATS = '''
+        SELECT COUNT(*), AVG(hashrate), AVG(temperature)
+        FROM mining_data
+        WHERE timestamp > ?
+    '''
+    
+    SQL_INSERT_SHARE = '''
+        INSERT INTO share_submissions (share_type, difficulty, accepted, response_time)
+        VALUES (?, ?, ?, ?)
+    '''
+    
+    SQL_SHARE_STATS = '''
+        SELECT
+            COUNT(*) as total_shares,
+            SUM(CASE WHEN accepted = 1 THEN 1 ELSE 0 END) as accepted_shares,
+            SUM(CASE WHEN accepted = 0 THEN 1 ELSE 0 END) as rejected_shares,
+            AVG(response_time) as avg_response_time
+        FROM share_submissions
+        WHERE timestamp > ?
+    '''
+    
+    SQL_INSERT_ALERT = '''
+        INSERT INTO alerts (alert_type, message, severity)
+        VALUES (?, ?, ?)
+    '''
+    
+    SQL_UNACKNOWLEDGED_ALERTS = '''
+        SELECT * FROM alerts
+        WHERE acknowledged = FALSE
+        ORDER BY timestamp DESC
+    '''
+    
+    SQL_ACKNOWLEDGE_ALERT = "UPDATE alerts SET acknowledged = TRUE WHERE id = ?"
+    
+    SQL_INSERT_OPT_HISTORY = '''
+        INSERT INTO optimization_history (
+            frequency, voltage, hashrate_before, hashrate_after,
+            temperature_before, temperature_after, improvement_percent, success
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    SQL_SAVE_OPT_CACHE = '''
+        INSERT OR REPLACE INTO optimization_cache
+            (device, frequency, voltage, firmware, hashrate, temperature, stability, ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    SQL_LOAD_OPT_CACHE = '''
+        SELECT frequency, voltage, hashrate, temperature, stability, ts
+        FROM optimization_cache
+        WHERE device IS ? AND firmware IS ? AND ts > ?
+    '''
+    
+    SQL_CLEAR_OPT_CACHE = "DELETE FROM optimization_cache WHERE device IS ? AND firmware IS NOT ?"
+    
+    SQL_CLEANUP_MINING = "DELETE FROM mining_data WHERE timestamp < ?"
+    SQL_CLEANUP_SHARES = "DELETE FROM share_submissions WHERE timestamp < ?"
+    SQL_CLEANUP_ALERTS = (
+        "DELETE FROM alerts WHERE timestamp < ? AND acknowledged = TRUE"
+    )
+    
+    def __init__(self, db_file="bitaxe_data.db", flush_rows: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
         self.db_file = db_file
-        self.connection = None
-        self.lock = threading.Lock()
+        self.mining_flush_rows = flush_rows or self.MINING_FLUSH_ROWS
+        self.mining_flush_interval = flush_interval or self.MINING_FLUSH_INTERVAL
+        self.connection = None  # write connection, owned by the writer thread
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._mining_buf: List[tuple] = []
+        self._mining_retry = False  # the buffer already failed to write once
+        self._last_mining_flush = time.monotonic()
+        
+        # Writes are serialized through one writer thread; reads use
+        # per-thread read-only connections, so WAL handles all concurrency
+        # and no Python lock is held around database access
+        self._write_q: queue.Queue = queue.Queue()
+        self._writer = None
+        self._tls = threading.local()
+        self._readers: List[sqlite3.Connection] = []
     
     def initialize(self):
         """Initialize database and create tables"""
         try:
-            self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
+            # Autocommit mode: the writer opens its own BEGIN IMMEDIATE transactions
+            self.connection = sqlite3.connect(self.db_file, check_same_thread=False,
+                                              isolation_level=None)
+            self._apply_pragmas(self.connection, self.PRAGMAS)
             self._create_tables()
+            
+            self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+            self._writer.start()
             logging.info("Database initialized successfully")
         except Exception as e:
             logging.error(f"Database initialization failed: {e}")
             raise
     
+    @classmethod
+    def _cutoff(cls, **delta) -> str:
+        """Timestamp `delta` ago, formatted to compare directly against stored timestamps"""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(**delta)
+        return cutoff.strftime(cls.TIMESTAMP_FORMAT)
+    
+    def _apply_pragmas(self, connection: sqlite3.Connection, pragmas):
+        """Apply connection-level performance settings"""
+        for pragma in pragmas:
+            connection.execute(pragma)
+    
     def _create_tables(self):
         """Create database tables if they don't exist"""
-        with self.lock:
-            cursor = self.connection.cursor()
+        cursor = self.connection.cursor()
+        cursor.executescript(self.SQL_SCHEMA)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, opening it on first use"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            uri = f"{Path(self.db_file).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._apply_pragmas(conn, self.READER_PRAGMAS)
+            self._tls.conn = conn
+            self._readers.append(conn)  # list.append is atomic; only close() iterates
+        return conn
+    
+    # Writer thread
+    
+    def _submit(self, job, wait: bool = False):
+        """Queue a write job for the writer thread, optionally blocking for its result"""
+        if self._writer is None or not self._writer.is_alive():
+            if wait:
+                raise sqlite3.ProgrammingError("Database is not open")
+            logging.error("Database write dropped: database is not open")
+            return None
+        
+        future = Future() if wait else None
+        self._write_q.put((job, future))
+        if future:
+            return future.result()
+        return None
+    
+    def _writer_loop(self):
+        """Execute queued write jobs on the write connection until stopped"""
+        idle_timeout = min(self.COMMIT_INTERVAL, self.mining_flush_interval)
+        while True:
+            try:
+                item = self._write_q.get(timeout=idle_timeout)
+            except queue.Empty:
+                # Idle: don't leave a partial batch uncommitted or a stale buffer unwritten
+                try:
+                    self._flush_stale()
+                except Exception as e:
+                    # e.g. "database is locked"; the writer must keep serving the queue
+                    logging.error(f"Database idle flush failed: {e}")
+                    self._rollback()
+                continue
             
-            # Mining data table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS mining_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    hashrate REAL,
-                    temperature REAL,
-                    power REAL,
-                    voltage REAL,
-                    frequency INTEGER,
-                    difficulty REAL,
-                    shares_accepted INTEGER,
-                    shares_rejected INTEGER,
-                    uptime INTEGER,
-                    fan_speed INTEGER,
-                    chip_temperature REAL,
-                    pool_url TEXT,
-                    worker_name TEXT
-                )
-            ''')
+            if item is None:
+                self._flush_all()
+                self.connection.close()
+                return
             
-            # Settings optimization history
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS optimization_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    frequency INTEGER,
-                    voltage REAL,
-                    hashrate_before REAL,
-                    hashrate_after REAL,
-                    temperature_before REAL,
-                    temperature_after REAL,
-                    improvement_percent REAL,
-                    success BOOLEAN
-                )
-            ''')
+            job, future = item
+            try:
+                result = job()
+            except Exception as e:
+                if future:
+                    future.set_exception(e)
+                else:
+                    logging.error(f"Database write failed: {e}")
+            else:
+                if future:
+                    future.set_result(result)
+    
+    def _begin(self):
+        """Start a write transaction unless one is already open (writer thread only)"""
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+    
+    def _commit(self):
+        """Commit the current transaction, including any batched inserts (writer thread only)"""
+        self.connection.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+    
+    def _rollback(self):
+        """Abandon the open transaction after a failed write (writer thread only)"""
+        if self._pending:
+            logging.error(f"Rolling back {self._pending} uncommitted database writes")
+        try:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+        except Exception as e:
+            logging.error(f"Database rollback failed: {e}")
+        self._pending = 0
+        self._last_commit = time.monotonic()
+    
+    def _maybe_commit(self):
+        """Commit once enough inserts are pending or the batch has aged (writer thread only)"""
+        self._pending += 1
+        if (self._pending >= self.COMMIT_EVERY or
+                time.monotonic() - self._last_commit >= self.COMMIT_INTERVAL):
+            self._commit()
+    
+    def _flush_all(self):
+        """Write buffered mining rows and commit any open transaction (writer thread only)"""
+        self._flush_mining()
+        if self._pending:
+            self._commit()
+    
+    def _flush_stale(self):
+        """Write the mining buffer once its window has elapsed and commit pending inserts (writer thread only)"""
+        if time.monotonic() - self._last_mining_flush >= self.mining_flush_interval:
+            self._flush_mining()
+        if self._pending:
+            self._commit()
+    
+    def _buffer_mining(self, row: tuple):
+        """Buffer a mining row, flushing when the buffer is full or stale (writer thread only)"""
+        if not self._mining_buf:
+            # The window starts with the first staged row, not the last flush
+            self._last_mining_flush = time.monotonic()
+        self._mining_buf.append(row)
+        if (len(self._mining_buf) >= self.mining_flush_rows or
+                time.monotonic() - self._last_mining_flush >= self.mining_flush_interval):
+            self._flush_mining()
+    
+    def _flush_mining(self):
+        """Write buffered mining rows in one executemany and commit (writer thread only)"""
+        if not self._mining_buf:
+            return
+        try:
+            self._begin()
+            # The transaction may already hold share/alert inserts whose row ids callers have;
+            # a failed batch is undone back to this savepoint only, leaving those pending
+            self.connection.execute("SAVEPOINT mining_batch")
+            try:
+                self.connection.executemany(self.SQL_INSERT_MINING, self._mining_buf)
+            except Exception:
+                self.connection.execute("ROLLBACK TO mining_batch")
+                self.connection.execute("RELEASE mining_batch")
+                raise
+            self.connection.execute("RELEASE mining_batch")
+            self._commit()
+        except Exception as e:
+            if self.connection.in_transaction and not self._pending:
+                # Nothing else is pending, so the whole (now empty) transaction can go
+                self._rollback()
+            if self._mining_retry:
+                logging.error(f"Error inserting mining data, dropped {len(self._mining_buf)} rows: {e}")
+            else:
+                # Keep the rows for one more attempt on the next flush
+                logging.error(f"Error inserting mining data, will retry {len(self._mining_buf)} rows: {e}")
+                self._mining_retry = True
+                self._last_mining_flush = time.monotonic()
+                return
+        self._mining_buf.clear()
+        self._mining_retry = False
+        self._last_mining_flush = time.monotonic()
+    
+    def _insert_share(self, params: tuple) -> int:
+        self._begin()
+        cursor = self.connection.cursor()
+        cursor.execute(self.SQL_INSERT_SHARE, params)
+        self._maybe_commit()
+        return cursor.lastrowid
+    
+    def _insert_alert(self, params: tuple) -> int:
+        self._begin()
+        cursor = self.connection.cursor()
+        cursor.execute(self.SQL_INSERT_ALERT, params)
+        self._commit()
+        return cursor.lastrowid
+    
+    def _acknowledge_alert(self, alert_id: int):
+        try:
+            self._begin()
+            self.connection.execute(self.SQL_ACKNOWLEDGE_ALERT, (alert_id,))
+            self._commit()
+        except Exception as e:
+            logging.error(f"Error acknowledging alert: {e}")
+    
+    def _insert_opt_history(self, rows: List[tuple]):
+        self._begin()
+        self.connection.executemany(self.SQL_INSERT_OPT_HISTORY, rows)
+        self._commit()
+    
+    def _save_opt_cache(self, params: tuple):
+        self._begin()
+        self.connection.execute(self.SQL_SAVE_OPT_CACHE, params)
+        self._commit()
+    
+    def _clear_opt_cache(self, device: Optional[str], keep_firmware: Optional[str]):
+        self._begin()
+        self.connection.execute(self.SQL_CLEAR_OPT_CACHE, (device, keep_firmware))
+        self._commit()
+    
+    def _cleanup_old_data(self, retention_days: int):
+        try:
+            self._flush_mining()
+            self._begin()
+            cursor = self.connection.cursor()
+            cutoff = self._cutoff(days=retention_days)
+            
+            # Clean mining data
+            cursor.execute(self.SQL_CLEANUP_MINING, (cutoff,))
             
-            # Share submissions
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS share_submissions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    share_type TEXT,
-                    difficulty REAL,
-                    accepted BOOLEAN,
-                    response_time REAL
-                )
-            ''')
+            # Clean share submissions
+            cursor.execute(self.SQL_CLEANUP_SHARES, (cutoff,))
             
-            # Alerts and notifications
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    alert_type TEXT,
-                    message TEXT,
-                    severity TEXT,
-                    acknowledged BOOLEAN DEFAULT FALSE
-                )
-            ''')
+            # Clean old acknowledged alerts
+            cursor.execute(self.SQL_CLEANUP_ALERTS, (cutoff,))
             
-            self.connection.commit()
+            self._commit()
+            logging.info(f"Cleaned up data older than {retention_days} days")
+        except Exception as e:
+            logging.error(f"Error cleaning up old data: {e}")
+    
+    # Public API
+    
+    def flush(self):
+        """Block until every queued write is committed and visible to readers"""
+        # Reads see the last committed state without waiting on the writer; call this
+        # first only when a read must include writes that may still be queued or buffered
+        self._submit(self._flush_all, wait=True)
     
     def insert_mining_data(self, data: Dict[str, Any]):
-        """Insert mining data record"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    INSERT INTO mining_data (
-                        hashrate, temperature, power, voltage, frequency,
-                        difficulty, shares_accepted, shares_rejected, uptime,
-                        fan_speed, chip_temperature, pool_url, worker_name
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data.get('hashrate', 0),
-                    data.get('temperature', 0),
-                    data.get('power', 0),
-                    data.get('voltage', 0),
-                    data.get('frequency', 0),
-                    data.get('difficulty', 0),
-                    data.get('shares_accepted', 0),
-                    data.get('shares_rejected', 0),
-                    data.get('uptime', 0),
-                    data.get('fan_speed', 0),
-                    data.get('chip_temperature', 0),
-                    data.get('pool_url', ''),
-                    data.get('worker_name', '')
-                ))
-                self.connection.commit()
-            except Exception as e:
-                logging.error(f"Error inserting mining data: {e}")
+        """Queue a mining data record for the next batched write"""
+        row = (
+            datetime.datetime.now(datetime.timezone.utc).strftime(self.TIMESTAMP_FORMAT),
+            data.get('hashrate', 0),
+            data.get('temperature', 0),
+            data.get('power', 0),
+            data.get('voltage', 0),
+            data.get('frequency', 0),
+            data.get('difficulty', 0),
+            data.get('shares_accepted', 0),
+            data.get('shares_rejected', 0),
+            data.get('uptime', 0),
+            data.get('fan_speed', 0),
+            data.get('chip_temperature', 0),
+            data.get('pool_url', ''),
+            data.get('worker_name', '')
+        )
+        self._submit(lambda: self._buffer_mining(row))
+    
+    def _fetch_dicts(self, cursor: sqlite3.Cursor) -> List[Dict]:
+        """Materialize result rows as dicts, resolving the column names once"""
+        cols = [c[0] for c in cursor.description]
+        return [dict(zip(cols, row)) for row in cursor.fetchall()]
     
     def get_recent_data(self, hours: int = 24) -> List[Dict]:
         """Get recent mining data"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    SELECT * FROM mining_data 
-                    WHERE timestamp > datetime('now', '-' || ? || ' hours')
-                    ORDER BY timestamp DESC
-                ''', (hours,))
-                
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
-            except Exception as e:
-                logging.error(f"Error fetching recent data: {e}")
-                return []
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_RECENT, (self._cutoff(hours=hours),))
+            return self._fetch_dicts(cursor)
+        except Exception as e:
+            logging.error(f"Error fetching recent data: {e}")
+            return []
+    
+    def get_recent_data_raw(self, hours: int = 24) -> Tuple[List[str], List[tuple]]:
+        """Get recent mining data as (column names, row tuples) for callers that only iterate"""
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_RECENT, (self._cutoff(hours=hours),))
+            return [c[0] for c in cursor.description], cursor.fetchall()
+        except Exception as e:
+            logging.error(f"Error fetching recent data: {e}")
+            return [], []
     
     def get_chart_data(self, hours: int = 24, limit: int = 100) -> Dict[str, List]:
-        """Get data formatted for charts"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    SELECT timestamp, hashrate, temperature, power
-                    FROM mining_data 
-                    WHERE timestamp > datetime('now', '-' || ? || ' hours')
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (hours, limit))
-                
-                rows = cursor.fetchall()
-                
-                # Reverse to get chronological order
-                rows = rows[::-1]
-                
-                return {
-                    'timestamps': [row['timestamp'] for row in rows],
-                    'hashrates': [row['hashrate'] for row in rows],
-                    'temperatures': [row['temperature'] for row in rows],
-                    'power': [row['power'] for row in rows]
-                }
-            except Exception as e:
-                logging.error(f"Error fetching chart data: {e}")
-                return {'timestamps': [], 'hashrates': [], 'temperatures': [], 'power': []}
+        """Get data formatted for charts, evenly downsampled to at most `limit` points"""
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_CHART, (self._cutoff(hours=hours),))
+            
+            # Build the columns in one pass over the cursor, already in chronological order
+            timestamps, hashrates, temperatures, power = [], [], [], []
+            for row in cursor:
+                timestamps.append(row[0])
+                hashrates.append(row[1])
+                temperatures.append(row[2])
+                power.append(row[3])
+            
+            # Pick evenly spaced samples across the whole window, keeping both ends
+            count = len(timestamps)
+            if count > limit:
+                idx = np.linspace(0, count - 1, limit).astype(np.int64)
+                timestamps = [timestamps[i] for i in idx.tolist()]
+                hashrates = np.asarray(hashrates, dtype=np.float64)[idx].tolist()
+                temperatures = np.asarray(temperatures, dtype=np.float64)[idx].tolist()
+                power = np.asarray(power, dtype=np.float64)[idx].tolist()
+            
+            return {
+                'timestamps': timestamps,
+                'hashrates': hashrates,
+                'temperatures': temperatures,
+                'power': power
+            }
+        except Exception as e:
+            logging.error(f"Error fetching chart data: {e}")
+            return {'timestamps': [], 'hashrates': [], 'temperatures': [], 'power': []}
+    
+    def get_daily_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Aggregate mining and share statistics for the daily report"""
+        stats = {
+            'avg_hashrate': 0, 'avg_temperature': 0, 'avg_power': 0,
+            'max_temperature': 0, 'min_hashrate': 0, 'max_hashrate': 0, 'uptime_hours': 0
+        }
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_DAILY_STATS, (self._cutoff(hours=hours),))
+            row = cursor.fetchone()
+            if row:
+                stats['avg_hashrate'] = row[0] or 0
+                stats['avg_temperature'] = row[1] or 0
+                stats['avg_power'] = row[2] or 0
+                stats['max_temperature'] = row[3] or 0
+                stats['min_hashrate'] = row[4] or 0
+                stats['max_hashrate'] = row[5] or 0
+                stats['uptime_hours'] = (row[6] or 0) / 3600
+        except Exception as e:
+            logging.error(f"Error fetching daily stats: {e}")
+        
+        stats.update(self.get_share_stats(hours))
+        return stats
+    
+    def get_average_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Get row count and average hashrate/temperature over the window, aggregated in SQL"""
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_AVERAGE_STATS, (self._cutoff(hours=hours),))
+            count, avg_hashrate, avg_temperature = cursor.fetchone()
+            return {
+                'count': count,
+                'avg_hashrate': avg_hashrate or 0,
+                'avg_temperature': avg_temperature or 0
+            }
+        except Exception as e:
+            logging.error(f"Error fetching average stats: {e}")
+            return {'count': 0, 'avg_hashrate': 0, 'avg_temperature': 0}
     
     def insert_share_submission(self, share_data: Dict[str, Any]):
         """Insert share submission record"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    INSERT INTO share_submissions (share_type, difficulty, accepted, response_time)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    share_data.get('share_type', 'regular'),
-                    share_data.get('difficulty', 0),
-                    share_data.get('accepted', True),
-                    share_data.get('response_time', 0)
-                ))
-                self.connection.commit()
-                return cursor.lastrowid
-            except Exception as e:
-                logging.error(f"Error inserting share submission: {e}")
-                return None
+        params = (
+            share_data.get('share_type', 'regular'),
+            share_data.get('difficulty', 0),
+            share_data.get('accepted', True),
+            share_data.get('response_time', 0)
+        )
+        try:
+            return self._submit(lambda: self._insert_share(params), wait=True)
+        except Exception as e:
+            logging.error(f"Error inserting share submission: {e}")
+            return None
     
     def get_share_stats(self, hours: int = 24) -> Dict[str, Any]:
         """Get share submission statistics"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as total_shares,
-                        SUM(CASE WHEN accepted = 1 THEN 1 ELSE 0 END) as accepted_shares,
-                        SUM(CASE WHEN accepted = 0 THEN 1 ELSE 0 END) as rejected_shares,
-                        AVG(response_time) as avg_response_time
-                    FROM share_submissions 
-                    WHERE timestamp > datetime('now', '-{} hours')
-                '''.format(hours))
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_SHARE_STATS, (self._cutoff(hours=hours),))
+            
+            row = cursor.fetchone()
+            if row:
+                total = row[0] or 0
+                accepted = row[1] or 0
+                rejected = row[2] or 0
                 
-                row = cursor.fetchone()
-                if row:
-                    total = row['total_shares'] or 0
-                    accepted = row['accepted_shares'] or 0
-                    rejected = row['rejected_shares'] or 0
-                    
-                    return {
-                        'total_shares': total,
-                        'accepted_shares': accepted,
-                        'rejected_shares': rejected,
-                        'acceptance_rate': (accepted / total * 100) if total > 0 else 0,
-                        'avg_response_time': row['avg_response_time'] or 0
-                    }
-                else:
-                    return {
-                        'total_shares': 0,
-                        'accepted_shares': 0,
-                        'rejected_shares': 0,
-                        'acceptance_rate': 0,
-                        'avg_response_time': 0
-                    }
-            except Exception as e:
-                logging.error(f"Error fetching share stats: {e}")
+                return {
+                    'total_shares': total,
+                    'accepted_shares': accepted,
+                    'rejected_shares': rejected,
+                    'acceptance_rate': (accepted / total * 100) if total > 0 else 0,
+                    'avg_response_time': row[3] or 0
+                }
+            else:
                 return {
                     'total_shares': 0,
                     'accepted_shares': 0,
@@ -234,82 +637,96 @@ class Database:
                     'acceptance_rate': 0,
                     'avg_response_time': 0
                 }
+        except Exception as e:
+            logging.error(f"Error fetching share stats: {e}")
+            return {
+                'total_shares': 0,
+                'accepted_shares': 0,
+                'rejected_shares': 0,
+                'acceptance_rate': 0,
+                'avg_response_time': 0
+            }
     
     def insert_alert(self, alert_type: str, message: str, severity: str = "info"):
         """Insert alert record"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    INSERT INTO alerts (alert_type, message, severity)
-                    VALUES (?, ?, ?)
-                ''', (alert_type, message, severity))
-                self.connection.commit()
-                return cursor.lastrowid
-            except Exception as e:
-                logging.error(f"Error inserting alert: {e}")
-                return None
+        try:
+            return self._submit(lambda: self._insert_alert((alert_type, message, severity)), wait=True)
+        except Exception as e:
+            logging.error(f"Error inserting alert: {e}")
+            return None
     
     def get_unacknowledged_alerts(self) -> List[Dict]:
         """Get unacknowledged alerts"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    SELECT * FROM alerts 
-                    WHERE acknowledged = FALSE
-                    ORDER BY timestamp DESC
-                ''')
-                
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
-            except Exception as e:
-                logging.error(f"Error fetching alerts: {e}")
-                return []
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_UNACKNOWLEDGED_ALERTS)
+            return self._fetch_dicts(cursor)
+        except Exception as e:
+            logging.error(f"Error fetching alerts: {e}")
+            return []
     
     def acknowledge_alert(self, alert_id: int):
         """Mark alert as acknowledged"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute('''
-                    UPDATE alerts SET acknowledged = TRUE WHERE id = ?
-                ''', (alert_id,))
-                self.connection.commit()
-            except Exception as e:
-                logging.error(f"Error acknowledging alert: {e}")
+        self._submit(lambda: self._acknowledge_alert(alert_id))
     
     def cleanup_old_data(self, retention_days: int = 30):
         """Remove old data beyond retention period"""
-        with self.lock:
-            try:
-                cursor = self.connection.cursor()
-                
-                # Clean mining data
-                cursor.execute('''
-                    DELETE FROM mining_data 
-                    WHERE timestamp < datetime('now', '-{} days')
-                '''.format(retention_days))
-                
-                # Clean share submissions
-                cursor.execute('''
-                    DELETE FROM share_submissions 
-                    WHERE timestamp < datetime('now', '-{} days')
-                '''.format(retention_days))
-                
-                # Clean old acknowledged alerts
-                cursor.execute('''
-                    DELETE FROM alerts 
-                    WHERE timestamp < datetime('now', '-{} days') AND acknowledged = TRUE
-                '''.format(retention_days))
-                
-                self.connection.commit()
-                logging.info(f"Cleaned up data older than {retention_days} days")
-            except Exception as e:
-                logging.error(f"Error cleaning up old data: {e}")
+        self._submit(lambda: self._cleanup_old_data(retention_days))
+    
+    def insert_optimization_history_batch(self, results: List[Dict[str, Any]]):
+        """Insert optimization results in one transaction"""
+        rows = [(
+            r['frequency'],
+            r['voltage'],
+            r['hashrate_before'],
+            r['hashrate_after'],
+            r['temperature_before'],
+            r['temperature_after'],
+            r['improvement_percent'],
+            r['success']
+        ) for r in results]
+        if rows:
+            self._submit(lambda: self._insert_opt_history(rows))
+    
+    def save_optimization_cache(self, entry: Dict[str, Any]):
+        """Store (or replace) the cached optimizer result for one device's frequency/voltage pair"""
+        params = (
+            entry.get('device'),
+            entry['frequency'],
+            entry['voltage'],
+            entry.get('firmware'),
+            entry['hashrate'],
+            entry['temperature'],
+            entry['stability'],
+            entry.get('ts', time.time())
+        )
+        self._submit(lambda: self._save_opt_cache(params))
+    
+    def get_optimization_cache(self, device: Optional[str], firmware: Optional[str],
+                               max_age: float) -> List[Dict]:
+        """Get `device`'s cached optimizer results for `firmware` younger than `max_age` seconds"""
+        try:
+            cursor = self._conn().cursor()
+            cursor.execute(self.SQL_LOAD_OPT_CACHE, (device, firmware, time.time() - max_age))
+            return self._fetch_dicts(cursor)
+        except Exception as e:
+            logging.error(f"Error fetching optimization cache: {e}")
+            return []
+    
+    def clear_optimization_cache(self, device: Optional[str], keep_firmware: Optional[str] = None):
+        """Drop `device`'s cached optimizer results measured on any other firmware"""
+        self._submit(lambda: self._clear_opt_cache(device, keep_firmware))
     
     def close(self):
         """Close database connection"""
-        if self.connection:
+        if self._writer and self._writer.is_alive():
+            # The writer flushes, commits and closes the write connection on exit
+            self._write_q.put(None)
+            self._writer.join()
+        elif self.connection:
             self.connection.close()
-            logging.info("Database connection closed")
+        
+        for conn in self._readers:
+            conn.close()
+        self._readers.clear()
+        logging.info("Database connection closed")
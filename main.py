@@ -4,41 +4,66 @@ Bitaxe Gamma 601 Mining Monitor By ANDREW FREEMAN
 Main entry point for the desktop application
 """
 
-import tkinter as tk
-from tkinter import messagebox
 import sys
 import os
+import asyncio
 import threading
-import time
-from config import Config
-from database import Database
-from gui.main_window import MainWindow
 import logging
+from datetime import datetime, timedelta
+from logging.handlers import RotatingFileHandler
 
-# Configure logging
+# Configure logging; the file rotates so it never grows without bound
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('bitaxe_monitor.log'),
+        RotatingFileHandler('bitaxe_monitor.log', maxBytes=5 * 1024 * 1024, backupCount=3),
         logging.StreamHandler()
     ]
 )
 
+logger = logging.getLogger(__name__)
+
 class BitaxeMonitorApp:
+    __slots__ = ('config', 'database', 'notifications', 'root', 'main_window', 'running',
+                 'loop', '_loop_thread', '_daily_report')
+    
     def __init__(self):
+        from config import Config
         self.config = Config()
-        self.database = Database()
+        self.database = None
+        self.notifications = None
         self.root = None
         self.main_window = None
         self.running = False
+        self.loop = None
+        self._loop_thread = None
+        self._daily_report = None
         
     def initialize(self):
         """Initialize the application"""
         try:
+            # Heavyweight modules (GUI pulls in matplotlib) are only imported once we start
+            import tkinter as tk
+            from database import Database
+            from notifications import NotificationManager
+            from gui.main_window import MainWindow
+            
             # Initialize database
+            self.database = Database(
+                flush_rows=self.config.get('database.flush_rows', 32),
+                flush_interval=self.config.get('database.flush_interval', 2)
+            )
             self.database.initialize()
             
+            # Network I/O runs as coroutines on a background event loop while Tk keeps the main thread
+            self.start_event_loop()
+            
+            # Shared notification manager; keeps its SMTP session open between alerts
+            self.notifications = NotificationManager(self.config, loop=self.loop)
+            NotificationManager.set_shared(self.notifications)
+            self._daily_report = self.run_async(self._daily_report_loop())
+            
             # Create main window
             self.root = tk.Tk()
             self.root.title("Bitaxe Gamma 601 Monitor")
@@ -51,7 +76,7 @@ class BitaxeMonitorApp:
                 try:
                     self.root.iconbitmap(default=icon_path)
                 except Exception as e:
-                    logging.warning(f"Could not set icon: {e}")
+                    logger.warning("Could not set icon: %s", e)
             # else: skip setting icon
             
             # Initialize main window
@@ -60,20 +85,82 @@ class BitaxeMonitorApp:
             # Configure close event
             self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
             
-            logging.info("Application initialized successfully")
+            logger.info("Application initialized successfully")
             return True
             
         except Exception as e:
-            logging.error(f"Failed to initialize application: {e}")
-            # Only show messagebox if Tkinter root is initialized
-            try:
-                if self.root:
-                    messagebox.showerror("Initialization Error", 
-                                         f"Failed to initialize application:\n{e}")
-            except Exception as mb_e:
-                logging.error(f"Could not show error messagebox: {mb_e}")
+            logger.error("Failed to initialize application: %s", e)
+            self._safe_showerror("Initialization Error", f"Failed to initialize application:\n{e}")
             return False
     
+    def _safe_showerror(self, title: str, msg: str):
+        """Show an error dialog if Tk is up and we are on its thread; otherwise just log it"""
+        if not self.root or threading.current_thread() is not threading.main_thread():
+            logger.error("%s: %s", title, msg)
+            return
+        try:
+            from tkinter import messagebox
+            messagebox.showerror(title, msg)
+        except Exception as e:
+            logger.error("Could not show error messagebox: %s", e)
+    
+    def start_event_loop(self):
+        """Start the asyncio event loop on a daemon thread"""
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self.loop.run_forever, name="asyncio-loop",
+                                             daemon=True)
+        self._loop_thread.start()
+    
+    def run_async(self, coro):
+        """Schedule a coroutine on the background loop from any thread, returning a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    async def _daily_report_loop(self):
+        """Email the daily report at each local midnight, covering the previous 24 hours"""
+        while True:
+            now = datetime.now()
+            next_run = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            await asyncio.sleep((next_run - now).total_seconds())
+            # Opt-in; checked each night so toggling it in settings takes effect without a restart
+            if not self.config.get('notifications.daily_report', False):
+                continue
+            try:
+                await self.notifications.send_daily_report_async(self.database)
+            except Exception as e:
+                logger.error("Failed to send daily report: %s", e)
+    
+    def stop_event_loop(self):
+        """Stop the background event loop and wait for its thread to exit"""
+        if self.loop is None:
+            return
+        if self._daily_report is not None:
+            # The scheduler never finishes on its own; cancel it so the drain doesn't wait on it
+            self._daily_report.cancel()
+            self._daily_report = None
+        if self.loop.is_running():
+            # Let in-flight work (e.g. email sends) finish before the loop goes away
+            future = asyncio.run_coroutine_threadsafe(self._drain_tasks(), self.loop)
+            try:
+                future.result(timeout=5)
+            except Exception as e:
+                logger.warning("Pending tasks did not finish cleanly: %s", e)
+            finally:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._loop_thread:
+            self._loop_thread.join(timeout=5)
+        if not self.loop.is_running():
+            self.loop.close()
+        self.loop = None
+        self._loop_thread = None
+    
+    async def _drain_tasks(self):
+        """Wait for every other task on the loop, then close the async SMTP session"""
+        current = asyncio.current_task()
+        pending = [t for t in asyncio.all_tasks() if t is not current]
+        await asyncio.gather(*pending, return_exceptions=True)
+        if self.notifications:
+            await self.notifications.close_async()
+    
     def run(self):
         """Run the application"""
         if not self.initialize():
@@ -89,19 +176,16 @@ class BitaxeMonitorApp:
             self.root.mainloop()
             
         except KeyboardInterrupt:
-            logging.info("Application interrupted by user")
+            logger.info("Application interrupted by user")
         except Exception as e:
-            logging.error(f"Application error: {e}")
-            try:
-                if self.root:
-                    messagebox.showerror("Application Error", f"An error occurred: {e}")
-            except Exception as mb_e:
-                logging.error(f"Could not show error messagebox: {mb_e}")
+            logger.error("Application error: %s", e)
+            self._safe_showerror("Application Error", f"An error occurred: {e}")
         finally:
             self.cleanup()
     
     def on_closing(self):
         """Handle application closing"""
+        from tkinter import messagebox
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
             self.cleanup()
             self.root.destroy()
@@ -109,31 +193,43 @@ class BitaxeMonitorApp:
     def cleanup(self):
         """Cleanup resources"""
         self.running = False
+        if self.config:
+            try:
+                self.config.flush()
+            except Exception as e:
+                logger.warning("Error saving configuration: %s", e)
         if self.main_window:
             try:
                 self.main_window.stop()
             except Exception as e:
-                logging.warning(f"Error stopping main window: {e}")
+                logger.warning("Error stopping main window: %s", e)
+        if self.notifications:
+            try:
+                self.notifications.set_shared(None)
+                self.notifications.close()
+            except Exception as e:
+                logger.warning("Error closing notifications: %s", e)
+        try:
+            self.stop_event_loop()
+        except Exception as e:
+            logger.warning("Error stopping event loop: %s", e)
         if self.database:
             try:
                 self.database.close()
             except Exception as e:
-                logging.warning(f"Error closing database: {e}")
-        logging.info("Application cleanup completed")
+                logger.warning("Error closing database: %s", e)
+        logger.info("Application cleanup completed")
 
 def main():
     """Main entry point"""
+    app = None
     try:
         app = BitaxeMonitorApp()
         app.run()
     except Exception as e:
-        logging.error(f"Fatal error: {e}")
-        # Only show messagebox if Tkinter root is initialized
-        try:
-            if 'app' in locals() and getattr(app, 'root', None):
-                messagebox.showerror("Fatal Error", f"A fatal error occurred: {e}")
-        except Exception as mb_e:
-            logging.error(f"Could not show error messagebox: {mb_e}")
+        logger.error("Fatal error: %s", e)
+        if app is not None:
+            app._safe_showerror("Fatal Error", f"A fatal error occurred: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,286 +1,794 @@
 """
 Notification system for sending email alerts
+
+smtplib, aiosmtplib and the email package are imported on first send so loading this module stays cheap.
 """
 
-import smtplib
+import asyncio
+import html
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import re
+import threading
+import queue
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _load_aiosmtplib():
+    """Import aiosmtplib on first use; None when it isn't installed"""
+    try:
+        import aiosmtplib
+    except ImportError:  # optional; falls back to smtplib on a worker thread
+        return None
+    return aiosmtplib
+
+def _html_to_text(body: str) -> str:
+    """Rough plain-text rendering of an HTML body for the text/plain alternative"""
+    text = re.sub(r'(?i)<br\s*/?>|</p>|</div>|</li>|</h[1-6]>', '\n', body)
+    return html.unescape(re.sub(r'<[^>]+>', '', text))
+
+def _now_str(*, _now=datetime.now) -> str:
+    """Current local time as shown in email bodies"""
+    return f"{_now():%Y-%m-%d %H:%M:%S}"
+
+# Fixed leading part of the alert subjects that carry a reading
+_TEMP_SUBJ_PREFIX = "🔥 Bitaxe Temperature Alert - "
+_HASH_SUBJ_PREFIX = "📉 Bitaxe Hashrate Drop Alert - "
+_DAILY_SUBJ_PREFIX = "📊 Daily Bitaxe Report - "
+
+# Email body templates, formatted with str.format at send time; bodies whose only
+# variable part is the timestamp are split so a send is a single concatenation
+
+_TEST_EMAIL_PREFIX = """
+This is a test email from your Bitaxe Gamma 601 Monitor.
+
+If you received this email, your notification system is working correctly!
+
+Sent at: """
+_TEST_EMAIL_SUFFIX = """
+
+Best regards,
+Bitaxe Monitor
+"""
+
+TEMP_ALERT_TMPL = """
+TEMPERATURE ALERT
+
+Your Bitaxe Gamma 601 has exceeded the temperature threshold.
+
+Current Temperature: {temp:.1f}°C
+Threshold: {thr}°C
+
+Time: {ts}
+
+Recommended Actions:
+1. Check ambient temperature and ventilation
+2. Verify fan operation
+3. Consider reducing frequency/voltage if temperature persists
+4. Clean device if dusty
+
+Monitor your device to prevent overheating damage.
+
+Bitaxe Monitor
+"""
+
+HASHRATE_ALERT_TMPL = """
+HASHRATE DROP ALERT
+
+Your Bitaxe Gamma 601 hashrate has dropped significantly.
+
+Current Hashrate: {current:.1f} GH/s
+Expected Hashrate: {expected:.1f} GH/s
+Drop: {drop:.1f}%
+
+Time: {ts}
+
+Possible Causes:
+1. Network connectivity issues
+2. Pool problems
+3. Device overheating
+4. Hardware issues
+5. Suboptimal settings
+
+Check your device and network connection.
+
+Bitaxe Monitor
+"""
+
+_CONN_RESTORED_PREFIX = """
+CONNECTION RESTORED
+
+Your Bitaxe Gamma 601 connection has been restored.
+
+Time: """
+_CONN_RESTORED_SUFFIX = """
+
+The device is now responding normally.
+
+Bitaxe Monitor
+"""
+
+_CONN_LOST_PREFIX = """
+CONNECTION LOST
+
+Your Bitaxe Gamma 601 is not responding.
+
+Time: """
+_CONN_LOST_SUFFIX = """
+
+Possible Causes:
+1. Network connectivity issues
+2. Device powered off
+3. IP address changed
+4. Hardware failure
+
+Please check your device and network connection.
+
+Bitaxe Monitor
+"""
+
+OPT_SUCCESS_TMPL = """
+OPTIMIZATION SUCCESSFUL
+
+Your Bitaxe Gamma 601 has been optimized with improved settings.
+
+Device: {device}
+
+Results:
+- Previous Hashrate: {hashrate_before:.1f} GH/s
+- New Hashrate: {hashrate_after:.1f} GH/s
+- Improvement: {improvement_percent:.1f}%
+
+- Previous Temperature: {temperature_before:.1f}°C
+- New Temperature: {temperature_after:.1f}°C
+
+Settings Applied:
+- Frequency: {frequency} MHz
+- Voltage: {voltage:.2f} V
+
+Time: {ts}
+
+Your device is now running with optimized settings.
+
+Bitaxe Monitor
+"""
+
+OPT_FAILED_TMPL = """
+OPTIMIZATION FAILED
+
+The optimization process for your Bitaxe Gamma 601 did not find better settings.
+
+Device: {device}
+
+Current Performance:
+- Hashrate: {hashrate_before:.1f} GH/s
+- Temperature: {temperature_before:.1f}°C
+
+Time: {ts}
+
+Your device settings remain unchanged. You may want to:
+1. Monitor for longer to collect more data
+2. Check device temperature and cooling
+3. Manually adjust settings if needed
+
+Bitaxe Monitor
+"""
+
+DAILY_REPORT_TMPL = """
+DAILY PERFORMANCE REPORT
+
+24-Hour Summary for {date}
+
+Performance Metrics:
+- Average Hashrate: {avg_hashrate:.1f} GH/s
+- Average Temperature: {avg_temperature:.1f}°C
+- Average Power: {avg_power:.1f} W
+- Efficiency: {efficiency:.2f} GH/W
+
+Share Statistics:
+- Total Shares: {total_shares}
+- Accepted: {accepted_shares}
+- Rejected: {rejected_shares}
+- Accept Rate: {accept_rate:.1f}%
+
+Device Status:
+- Max Temperature: {max_temperature:.1f}°C
+- Min Hashrate: {min_hashrate:.1f} GH/s
+- Max Hashrate: {max_hashrate:.1f} GH/s
+- Uptime: {uptime_hours:.1f} hours
+
+Your Bitaxe Gamma 601 continues to operate efficiently.
+
+Bitaxe Monitor
+"""
+
+def _quit_quietly(server):
+    """Quit an SMTP session, falling back to closing the socket if the server is gone"""
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+class SMTPPool:
+    """Small pool of authenticated SMTP sessions, each recycled after max_msgs messages"""
+    
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 size: int = 2, max_msgs: int = 100):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_msgs = max_msgs
+        
+        # Idle (session, messages sent) pairs; LIFO so a burst keeps reusing the warmest session
+        self._idle: queue.LifoQueue = queue.LifoQueue(size)
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+    
+    def _connect(self) -> 'smtplib.SMTP':
+        """Open and authenticate a new SMTP session"""
+        import smtplib
+        
+        server = smtplib.SMTP(self.host, self.port)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+    
+    def _take(self) -> Tuple['smtplib.SMTP', int]:
+        """Pop a healthy idle session or open a new one"""
+        import smtplib
+        
+        while True:
+            try:
+                server, sent = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), 0
+            try:
+                server.noop()
+                return server, sent
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPException, OSError):
+                _quit_quietly(server)
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a session for one message; it is dropped if the block raises"""
+        self._slots.acquire()
+        try:
+            server, sent = self._take()
+            try:
+                yield server
+            except Exception:
+                _quit_quietly(server)
+                raise
+            
+            sent += 1
+            if self._closed or sent >= self.max_msgs:
+                _quit_quietly(server)
+            else:
+                self._idle.put_nowait((server, sent))
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Quit every idle session; sessions in use are quit when they are returned"""
+        self._closed = True
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit_quietly(server)
+
 class NotificationManager:
-    def __init__(self, config: Config):
+    # Recycle an SMTP session after this many messages; providers throttle long-lived sessions
+    MAX_MESSAGES_PER_CONNECTION = 50
+    
+    # Concurrent SMTP sessions, so a test email needn't wait behind a batch of alerts
+    POOL_SIZE = 2
+    
+    # Alerts arriving this close together are sent as one batch, duplicates collapsed
+    COALESCE_WINDOW = 1.0
+    
+    # App-wide manager, registered by the application so components it doesn't construct
+    # (e.g. optimizers created by the GUI) send through it instead of building their own
+    _shared: Optional['NotificationManager'] = None
+    
+    @classmethod
+    def set_shared(cls, manager: Optional['NotificationManager']):
+        """Register (or with None, clear) the app-wide manager"""
+        cls._shared = manager
+    
+    @classmethod
+    def shared(cls) -> Optional['NotificationManager']:
+        """The app-wide manager, if the application registered one"""
+        return cls._shared
+    
+    def __init__(self, config: Config, loop: Optional[asyncio.AbstractEventLoop] = None):
         self.config = config
-        self.email_config = config.get_email_config()
+        self.loop = loop  # event loop that queued alerts are sent on, if the app runs one
         
-    def is_email_enabled(self) -> bool:
-        """Check if email notifications are enabled and configured"""
+        # Authenticated smtplib sessions are pooled and reused across alerts
+        self._pool = None
+        self._smtp_settings = None  # (host, port, sender, password) the pool was built with
+        
+        # The aiosmtplib session used on the event loop is kept open the same way
+        self._async_smtp = None
+        self._async_sent = 0
+        self._async_lock = None
+        
+        # Alerts are queued and sent by a background thread started on first use
+        self._outbox: queue.Queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        
+        # monotonic time each kind of alert last went out, for rate limiting
+        self._last_sent: Dict[str, float] = {}
+        
+        self._reload_config()
+        # Settings saved from the GUI go through Config.set, which notifies reload listeners
+        config.on_reload(self._on_config_reload)
+    
+    def _on_config_reload(self, _config: Config):
+        self.refresh_config()
+    
+    def refresh_config(self):
+        """Re-read email settings and revalidate them; runs whenever the config changes"""
+        old_pool = self._pool
+        self._reload_config()
+        
+        # Open sessions were authenticated with the old settings; keep them if those didn't change
+        if self._pool is old_pool:
+            return
+        if old_pool is not None:
+            old_pool.close()
+        if self._async_smtp is not None and self.loop is not None and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.close_async(), self.loop)
+    
+    def _reload_config(self):
+        """Resolve every setting the send paths use into attributes"""
+        self.email_config = self.config.get_email_config()
+        self._sender = self.email_config.get('sender_email', '')
+        self._password = self.email_config.get('sender_password', '')
+        # Comma or semicolon separated; one message is sent with every address on the envelope
+        self._recipients = [r.strip() for r in
+                            str(self.email_config.get('recipient_email', '')).replace(';', ',').split(',')
+                            if r.strip()]
+        self._smtp_host = self.email_config.get('smtp_server', 'smtp.gmail.com')
+        self._smtp_port = self.email_config.get('smtp_port', 587)
+        
+        # Alert thresholds and flags; refreshed on every config change like the rest
+        self._min_interval = self.config.get('notifications.email.min_interval_sec', 300)
+        self._temp_threshold = self.config.get('notifications.email.alerts.temperature_threshold', 85)
+        self._send_opt_alerts = self.config.get('notifications.email.alerts.optimal_settings_found', True)
+        self._email_enabled, self._email_enabled_reason = self._validate_email_config()
+        
+        # Any config change lands here, so only rebuild the pool when the SMTP settings changed
+        smtp_settings = (self._smtp_host, self._smtp_port, self._sender, self._password)
+        if self._pool is None or smtp_settings != self._smtp_settings:
+            self._smtp_settings = smtp_settings
+            self._pool = SMTPPool(self._smtp_host, self._smtp_port, self._sender, self._password,
+                                  size=self.POOL_SIZE, max_msgs=self.MAX_MESSAGES_PER_CONNECTION)
+    
+    def _validate_email_config(self) -> Tuple[bool, str]:
+        """Check the email settings once, returning (enabled, reason if not)"""
         if not self.config.get('notifications.email.enabled', False):
-            return False
+            return False, "disabled"
         
         required_fields = ['sender_email', 'sender_password', 'recipient_email']
         for field in required_fields:
             if not self.email_config.get(field):
-                logging.warning(f"Email notification disabled: missing {field}")
-                return False
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning("Email notification disabled: missing %s", field)
+                return False, f"missing {field}"
         
-        return True
+        return True, ""
+    
+    def is_email_enabled(self) -> bool:
+        """Check if email notifications are enabled and configured"""
+        return self._email_enabled
     
     def send_email(self, subject: str, body: str, is_html: bool = False) -> bool:
         """Send email notification"""
         if not self.is_email_enabled():
-            logging.info("Email notifications disabled, skipping email")
+            logger.info("Email notifications disabled, skipping email")
             return False
         
+        return self._send_batch([(subject, body, is_html)]) == [True]
+    
+    def _build_message(self, subject: str, body: str, is_html: bool,
+                       date: Optional[str] = None) -> 'EmailMessage':
+        """Build the email message; it is serialized by SMTP.send_message under the SMTP policy"""
+        from email import policy
+        from email.message import EmailMessage
+        from email.utils import formatdate
+        
+        msg = EmailMessage(policy=policy.SMTP)
+        msg['From'] = self._sender
+        msg['To'] = ', '.join(self._recipients)
+        msg['Subject'] = subject
+        msg['Date'] = date or formatdate(localtime=True)
+        
+        # Plain alerts are a single text/plain part; only HTML gets multipart/alternative
+        # with a text fallback for clients that won't render it
+        if is_html:
+            msg.set_content(_html_to_text(body))
+            msg.add_alternative(body, subtype='html')
+        else:
+            msg.set_content(body)
+        return msg
+    
+    def _send_batch(self, messages: List[Tuple[str, str, bool]], *,
+                    _info=logger.info, _error=logger.error) -> List[bool]:
+        """Send (subject, body, is_html) messages back-to-back over pooled sessions, returning which went out"""
+        import smtplib
+        from email.utils import formatdate
+        
+        # One Date header for the whole batch
+        date = formatdate(localtime=True)
+        
+        # smtplib is imported lazily, so it is bound here rather than as a default
+        disconnected = smtplib.SMTPServerDisconnected
+        build = self._build_message
+        recipients = self._recipients
+        acquire = self._pool.acquire
+        
+        delivered = []
+        for subject, body, is_html in messages:
+            try:
+                msg = build(subject, body, is_html, date)
+                try:
+                    with acquire() as server:
+                        server.send_message(msg, to_addrs=recipients)
+                except disconnected:
+                    # Dropped between the health check and the send; retry once on a fresh session
+                    with acquire() as server:
+                        server.send_message(msg, to_addrs=recipients)
+                
+                _info("Email sent successfully: %s", subject)
+                delivered.append(True)
+                
+            except Exception as e:
+                _error("Failed to send email: %s", e)
+                delivered.append(False)
+        return delivered
+    
+    async def send_email_async(self, subject: str, body: str, is_html: bool = False) -> bool:
+        """Send email notification without blocking the event loop"""
+        if not self.is_email_enabled():
+            logger.info("Email notifications disabled, skipping email")
+            return False
+        
+        return await self._send_batch_async([(subject, body, is_html)]) == [True]
+    
+    async def _send_batch_async(self, messages: List[Tuple[str, str, bool]]) -> List[bool]:
+        """Async counterpart of _send_batch using aiosmtplib"""
+        aiosmtplib = _load_aiosmtplib()
+        if aiosmtplib is None:
+            # No async SMTP client installed; keep the blocking sender off the loop
+            return await asyncio.get_running_loop().run_in_executor(None, self._send_batch, messages)
+        
+        from email.utils import formatdate
+        
+        date = formatdate(localtime=True)
+        delivered = []
+        async with self._get_async_lock():
+            for subject, body, is_html in messages:
+                try:
+                    msg = self._build_message(subject, body, is_html, date)
+                    try:
+                        smtp = await self._get_async_connection()
+                        await smtp.send_message(msg, recipients=self._recipients)
+                    except aiosmtplib.SMTPServerDisconnected:
+                        await self._disconnect_async()
+                        smtp = await self._get_async_connection()
+                        await smtp.send_message(msg, recipients=self._recipients)
+                    self._async_sent += 1
+                    if self._async_sent >= self.MAX_MESSAGES_PER_CONNECTION:
+                        await self._disconnect_async()
+                    
+                    logger.info("Email sent successfully: %s", subject)
+                    delivered.append(True)
+                    
+                except Exception as e:
+                    logger.error("Failed to send email: %s", e)
+                    delivered.append(False)
+        return delivered
+    
+    def _get_async_lock(self) -> asyncio.Lock:
+        """Lock guarding the aiosmtplib session, created on first use from the loop"""
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+    
+    async def _warm_async_connection(self):
+        """Open the aiosmtplib session ahead of a send; failures are left for the send to retry"""
+        if _load_aiosmtplib() is None:
+            return
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.email_config['sender_email']
-            msg['To'] = self.email_config['recipient_email']
-            msg['Subject'] = subject
-            
-            # Add body
-            if is_html:
-                msg.attach(MIMEText(body, 'html'))
-            else:
-                msg.attach(MIMEText(body, 'plain'))
-            
-            # Connect to SMTP server
-            smtp_server = self.email_config.get('smtp_server', 'smtp.gmail.com')
-            smtp_port = self.email_config.get('smtp_port', 587)
+            async with self._get_async_lock():
+                await self._get_async_connection()
+        except Exception as e:
+            logger.warning("Could not pre-connect to SMTP server: %s", e)
+    
+    async def _get_async_connection(self):
+        """Return the cached aiosmtplib session, reconnecting if needed (caller holds _async_lock)"""
+        aiosmtplib = _load_aiosmtplib()
+        if self._async_smtp is not None:
+            try:
+                await self._async_smtp.noop()
+                return self._async_smtp
+            except (aiosmtplib.SMTPException, OSError):
+                await self._disconnect_async()
+        
+        smtp = aiosmtplib.SMTP(
+            hostname=self._smtp_host,
+            port=self._smtp_port,
+            start_tls=False
+        )
+        await smtp.connect()
+        await smtp.starttls()
+        await smtp.login(self._sender, self._password)
+        self._async_smtp = smtp
+        self._async_sent = 0
+        return smtp
+    
+    async def _disconnect_async(self):
+        """Quit the cached aiosmtplib session, ignoring errors from a dead socket (caller holds _async_lock)"""
+        smtp, self._async_smtp = self._async_smtp, None
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    async def close_async(self):
+        """Close the aiosmtplib session; must run on the loop that owns it"""
+        if self._async_lock is None:
+            return
+        async with self._async_lock:
+            await self._disconnect_async()
+    
+    def _deliver(self, messages: List[Tuple[str, str, bool]]) -> List[bool]:
+        """Send a batch from a worker thread, over aiosmtplib on the app's event loop when one is attached"""
+        if self.loop is not None and self.loop.is_running() and _load_aiosmtplib() is not None:
+            return asyncio.run_coroutine_threadsafe(self._send_batch_async(messages), self.loop).result()
+        return self._send_batch(messages)
+    
+    def _rate_limited(self, key: str) -> bool:
+        """Check whether an alert of this kind already went out within the minimum interval"""
+        last = self._last_sent.get(key)
+        return last is not None and time.monotonic() - last < self._min_interval
+    
+    def _queue_email(self, subject: str, body: str, dedupe_key: str, is_html: bool = False,
+                     rate_key: Optional[str] = None) -> bool:
+        """Hand an alert to the background sender; returns once it is queued"""
+        if not self.is_email_enabled():
+            logger.info("Email notifications disabled, skipping email")
+            return False
+        
+        # Stamped now so a burst isn't queued repeatedly; the worker clears it if the send fails
+        rate_key = rate_key or dedupe_key
+        queued_at = time.monotonic()
+        self._last_sent[rate_key] = queued_at
+        
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._worker_loop, name="notification-sender",
+                                                daemon=True)
+                self._worker.start()
+        
+        self._outbox.put((subject, body, is_html, dedupe_key, rate_key, queued_at))
+        return True
+    
+    def _worker_loop(self):
+        """Send queued alerts in batches, keeping only the newest alert per dedupe key"""
+        while True:
+            try:
+                item = self._outbox.get(timeout=2)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
             
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(
-                self.email_config['sender_email'],
-                self.email_config['sender_password']
-            )
+            # Give a burst from the same monitoring tick a moment to arrive, then drain it
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.COALESCE_WINDOW
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._outbox.get(timeout=remaining) if remaining > 0 else self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
             
-            # Send email
-            text = msg.as_string()
-            server.sendmail(
-                self.email_config['sender_email'],
-                self.email_config['recipient_email'],
-                text
-            )
-            server.quit()
+            latest: Dict[str, Tuple[str, str, bool, str, str, float]] = {}
+            for entry in batch:
+                latest.pop(entry[3], None)  # re-insert so send order follows the newest occurrence
+                latest[entry[3]] = entry
+            try:
+                delivered = self._deliver([(subject, body, is_html)
+                                           for subject, body, is_html, _, _, _ in latest.values()])
+            except Exception as e:
+                logger.error("Failed to send queued alerts: %s", e)
+                delivered = [False] * len(latest)
             
-            logging.info(f"Email sent successfully: {subject}")
-            return True
+            # An alert that never went out must not keep suppressing its kind for min_interval
+            failed = {key for key, ok in zip(latest, delivered) if not ok}
+            for _, _, _, dedupe_key, rate_key, queued_at in batch:
+                if dedupe_key in failed and self._last_sent.get(rate_key) == queued_at:
+                    del self._last_sent[rate_key]
             
-        except Exception as e:
-            logging.error(f"Failed to send email: {e}")
-            return False
+            if stopping:
+                return
+    
+    def close(self, timeout: float = 10.0):
+        """Send any queued alerts, stop the sender thread and close the SMTP connection"""
+        self.config.off_reload(self._on_config_reload)
+        if self._worker and self._worker.is_alive():
+            self._outbox.put(None)
+            self._worker.join(timeout)
+        if self._async_smtp is not None and self.loop is not None and self.loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self.close_async(), self.loop).result(timeout)
+            except Exception as e:
+                logger.warning("Error closing async SMTP session: %s", e)
+        self._pool.close()
     
     def send_test_email(self) -> bool:
         """Send a test email to verify configuration"""
         subject = "Bitaxe Monitor - Test Email"
-        body = f"""
-        This is a test email from your Bitaxe Gamma 601 Monitor.
-        
-        If you received this email, your notification system is working correctly!
-        
-        Sent at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        
-        Best regards,
-        Bitaxe Monitor
-        """
+        body = _TEST_EMAIL_PREFIX + _now_str() + _TEST_EMAIL_SUFFIX
         
         return self.send_email(subject, body)
     
     def send_temperature_alert(self, temperature: float) -> bool:
         """Send temperature alert email"""
-        threshold = self.config.get('notifications.email.alerts.temperature_threshold', 85)
-        
-        subject = f"🔥 Bitaxe Temperature Alert - {temperature:.1f}°C"
-        body = f"""
-        TEMPERATURE ALERT
-        
-        Your Bitaxe Gamma 601 has exceeded the temperature threshold.
-        
-        Current Temperature: {temperature:.1f}°C
-        Threshold: {threshold}°C
-        
-        Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        
-        Recommended Actions:
-        1. Check ambient temperature and ventilation
-        2. Verify fan operation
-        3. Consider reducing frequency/voltage if temperature persists
-        4. Clean device if dusty
+        if self._rate_limited('temperature'):
+            return False
         
-        Monitor your device to prevent overheating damage.
+        threshold = self._temp_threshold
+        ts = _now_str()
         
-        Bitaxe Monitor
-        """
+        subject = f"{_TEMP_SUBJ_PREFIX}{temperature:.1f}°C"
+        body = TEMP_ALERT_TMPL.format(temp=temperature, thr=threshold, ts=ts)
         
-        return self.send_email(subject, body)
+        return self._queue_email(subject, body, 'temperature')
     
     def send_hashrate_alert(self, current_hashrate: float, expected_hashrate: float) -> bool:
         """Send hashrate drop alert email"""
-        drop_percent = ((expected_hashrate - current_hashrate) / expected_hashrate) * 100
-        
-        subject = f"📉 Bitaxe Hashrate Drop Alert - {current_hashrate:.1f} GH/s"
-        body = f"""
-        HASHRATE DROP ALERT
-        
-        Your Bitaxe Gamma 601 hashrate has dropped significantly.
-        
-        Current Hashrate: {current_hashrate:.1f} GH/s
-        Expected Hashrate: {expected_hashrate:.1f} GH/s
-        Drop: {drop_percent:.1f}%
-        
-        Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        
-        Possible Causes:
-        1. Network connectivity issues
-        2. Pool problems
-        3. Device overheating
-        4. Hardware issues
-        5. Suboptimal settings
+        if self._rate_limited('hashrate'):
+            return False
         
-        Check your device and network connection.
+        drop_percent = ((expected_hashrate - current_hashrate) / expected_hashrate) * 100
+        ts = _now_str()
         
-        Bitaxe Monitor
-        """
+        subject = f"{_HASH_SUBJ_PREFIX}{current_hashrate:.1f} GH/s"
+        body = HASHRATE_ALERT_TMPL.format(current=current_hashrate, expected=expected_hashrate,
+                                          drop=drop_percent, ts=ts)
         
-        return self.send_email(subject, body)
+        return self._queue_email(subject, body, 'hashrate')
     
     def send_connection_alert(self, connected: bool) -> bool:
         """Send connection status alert email"""
+        # Keyed by state so a flip between lost and restored is always reported
+        rate_key = f'connection_{connected}'
+        if self._rate_limited(rate_key):
+            return False
+        
+        ts = _now_str()
         if connected:
             subject = "✅ Bitaxe Connection Restored"
-            body = f"""
-            CONNECTION RESTORED
-            
-            Your Bitaxe Gamma 601 connection has been restored.
-            
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            
-            The device is now responding normally.
-            
-            Bitaxe Monitor
-            """
+            body = _CONN_RESTORED_PREFIX + ts + _CONN_RESTORED_SUFFIX
         else:
             subject = "🔌 Bitaxe Connection Lost"
-            body = f"""
-            CONNECTION LOST
-            
-            Your Bitaxe Gamma 601 is not responding.
-            
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            
-            Possible Causes:
-            1. Network connectivity issues
-            2. Device powered off
-            3. IP address changed
-            4. Hardware failure
-            
-            Please check your device and network connection.
-            
-            Bitaxe Monitor
-            """
+            body = _CONN_LOST_PREFIX + ts + _CONN_LOST_SUFFIX
         
-        return self.send_email(subject, body)
+        return self._queue_email(subject, body, 'connection', rate_key=rate_key)
     
     def send_optimization_alert(self, results: Dict[str, Any]) -> bool:
-        """Send optimization results email"""
-        if not self.config.get('notifications.email.alerts.optimal_settings_found', True):
+        """Send optimization results email; results['device'] identifies the unit"""
+        if not self._send_opt_alerts:
+            return False
+        
+        get = results.get
+        # Keyed per device so units of a fleet finishing together each get their alert
+        device = get('device')
+        key = f'optimization:{device}' if device else 'optimization'
+        if self._rate_limited(key):
             return False
         
-        success = results.get('success', False)
+        device = device or 'unknown'
+        ts = _now_str()
         
-        if success:
+        if get('success', False):
             subject = "🎯 Bitaxe Optimization Complete - Improved Performance"
-            body = f"""
-            OPTIMIZATION SUCCESSFUL
-            
-            Your Bitaxe Gamma 601 has been optimized with improved settings.
-            
-            Results:
-            - Previous Hashrate: {results.get('hashrate_before', 0):.1f} GH/s
-            - New Hashrate: {results.get('hashrate_after', 0):.1f} GH/s
-            - Improvement: {results.get('improvement_percent', 0):.1f}%
-            
-            - Previous Temperature: {results.get('temperature_before', 0):.1f}°C
-            - New Temperature: {results.get('temperature_after', 0):.1f}°C
-            
-            Settings Applied:
-            - Frequency: {results.get('frequency', 0)} MHz
-            - Voltage: {results.get('voltage', 0):.2f} V
-            
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            
-            Your device is now running with optimized settings.
-            
-            Bitaxe Monitor
-            """
+            body = OPT_SUCCESS_TMPL.format(
+                hashrate_before=get('hashrate_before', 0),
+                hashrate_after=get('hashrate_after', 0),
+                improvement_percent=get('improvement_percent', 0),
+                temperature_before=get('temperature_before', 0),
+                temperature_after=get('temperature_after', 0),
+                frequency=get('frequency', 0),
+                voltage=get('voltage', 0),
+                device=device,
+                ts=ts
+            )
         else:
             subject = "⚠️ Bitaxe Optimization Failed"
-            body = f"""
-            OPTIMIZATION FAILED
-            
-            The optimization process for your Bitaxe Gamma 601 did not find better settings.
-            
-            Current Performance:
-            - Hashrate: {results.get('hashrate_before', 0):.1f} GH/s
-            - Temperature: {results.get('temperature_before', 0):.1f}°C
-            
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            
-            Your device settings remain unchanged. You may want to:
-            1. Monitor for longer to collect more data
-            2. Check device temperature and cooling
-            3. Manually adjust settings if needed
-            
-            Bitaxe Monitor
-            """
+            body = OPT_FAILED_TMPL.format(
+                hashrate_before=get('hashrate_before', 0),
+                temperature_before=get('temperature_before', 0),
+                device=device,
+                ts=ts
+            )
         
-        return self.send_email(subject, body)
+        return self._queue_email(subject, body, key)
     
-    def send_daily_report(self, stats: Dict[str, Any]) -> bool:
-        """Send daily performance report email"""
-        subject = f"📊 Daily Bitaxe Report - {datetime.now().strftime('%Y-%m-%d')}"
+    def _format_daily_report(self, stats: Dict[str, Any]) -> Tuple[str, str]:
+        """Render the daily report subject and body from aggregated stats"""
+        get = stats.get
+        date = f"{datetime.now():%Y-%m-%d}"
+        subject = _DAILY_SUBJ_PREFIX + date
         
         # Calculate 24h averages
-        avg_hashrate = stats.get('avg_hashrate', 0)
-        avg_temperature = stats.get('avg_temperature', 0)
-        avg_power = stats.get('avg_power', 0)
-        efficiency = avg_hashrate / avg_power if avg_power > 0 else 0
-        
-        total_shares = stats.get('total_shares', 0)
-        accepted_shares = stats.get('accepted_shares', 0)
-        rejected_shares = stats.get('rejected_shares', 0)
-        accept_rate = (accepted_shares / total_shares * 100) if total_shares > 0 else 0
-        
-        body = f"""
-        DAILY PERFORMANCE REPORT
-        
-        24-Hour Summary for {datetime.now().strftime('%Y-%m-%d')}
-        
-        Performance Metrics:
-        - Average Hashrate: {avg_hashrate:.1f} GH/s
-        - Average Temperature: {avg_temperature:.1f}°C
-        - Average Power: {avg_power:.1f} W
-        - Efficiency: {efficiency:.2f} GH/W
-        
-        Share Statistics:
-        - Total Shares: {total_shares}
-        - Accepted: {accepted_shares}
-        - Rejected: {rejected_shares}
-        - Accept Rate: {accept_rate:.1f}%
-        
-        Device Status:
-        - Max Temperature: {stats.get('max_temperature', 0):.1f}°C
-        - Min Hashrate: {stats.get('min_hashrate', 0):.1f} GH/s
-        - Max Hashrate: {stats.get('max_hashrate', 0):.1f} GH/s
-        - Uptime: {stats.get('uptime_hours', 0):.1f} hours
+        avg_hashrate = get('avg_hashrate', 0)
+        avg_power = get('avg_power', 0)
+        total_shares = get('total_shares', 0)
+        accepted_shares = get('accepted_shares', 0)
+        
+        body = DAILY_REPORT_TMPL.format(
+            date=date,
+            avg_hashrate=avg_hashrate,
+            avg_temperature=get('avg_temperature', 0),
+            avg_power=avg_power,
+            efficiency=avg_hashrate / avg_power if avg_power > 0 else 0,
+            total_shares=total_shares,
+            accepted_shares=accepted_shares,
+            rejected_shares=get('rejected_shares', 0),
+            accept_rate=(accepted_shares / total_shares * 100) if total_shares > 0 else 0,
+            max_temperature=get('max_temperature', 0),
+            min_hashrate=get('min_hashrate', 0),
+            max_hashrate=get('max_hashrate', 0),
+            uptime_hours=get('uptime_hours', 0)
+        )
+        return subject, body
+    
+    def send_daily_report(self, stats: Dict[str, Any]) -> bool:
+        """Send daily performance report email"""
+        if self._rate_limited('daily_report'):
+            return False
         
-        Your Bitaxe Gamma 601 continues to operate efficiently.
+        subject, body = self._format_daily_report(stats)
+        return self._queue_email(subject, body, 'daily_report')
+    
+    async def send_daily_report_async(self, database) -> bool:
+        """Query the daily stats and open the SMTP session concurrently, then send the report"""
+        if not self.is_email_enabled():
+            logger.info("Email notifications disabled, skipping email")
+            return False
+        if self._rate_limited('daily_report'):
+            return False
         
-        Bitaxe Monitor
-        """
+        stats_task = asyncio.create_task(asyncio.to_thread(database.get_daily_stats))
+        smtp_task = asyncio.create_task(self._warm_async_connection())
+        stats, _ = await asyncio.gather(stats_task, smtp_task)
         
-        return self.send_email(subject, body)
+        subject, body = self._format_daily_report(stats)
+        sent = await self._send_batch_async([(subject, body, False)]) == [True]
+        if sent:
+            self._last_sent['daily_report'] = time.monotonic()
+        return sent
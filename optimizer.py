@@ -3,15 +3,24 @@ Performance optimization module for Bitaxe Gamma 601
 Automatically finds optimal frequency and voltage settings
 """
 
+import math
 import time
 import logging
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+import numpy as np
 from bitaxe_api import BitaxeAPI
 from config import Config
 from database import Database
 
+try:
+    import optuna
+except ImportError:  # optional; the grid sweep is used without it
+    optuna = None
+
 @dataclass
 class OptimizationResult:
     """Data class for optimization results"""
@@ -26,17 +35,129 @@ class OptimizationResult:
     test_duration: int
     stability_score: float
 
+@dataclass(frozen=True)
+class BaselineStats:
+    """Baseline figures every test in a search compares against, derived once"""
+    hashrate: float
+    temperature: float
+    frequency: int
+    voltage: float
+    inv_hashrate: float
+    plus_min: float  # hashrate a candidate must reach to count as an improvement
+    
+    @classmethod
+    def from_baseline(cls, baseline: Dict[str, Any], min_improvement: float) -> 'BaselineStats':
+        hashrate = baseline['hashrate']
+        return cls(hashrate=hashrate,
+                   temperature=baseline['temperature'],
+                   frequency=baseline['frequency'],
+                   voltage=baseline['voltage'],
+                   inv_hashrate=1.0 / hashrate,
+                   plus_min=hashrate * (1 + min_improvement / 100))
+
+class RunningStats:
+    """Running hashrate mean/variance (Welford) and mean temperature, O(1) per sample"""
+    __slots__ = ('n', 'mean_h', 'm2_h', 'mean_t')
+    
+    def __init__(self):
+        self.n = 0
+        self.mean_h = 0.0
+        self.m2_h = 0.0
+        self.mean_t = 0.0
+    
+    def push(self, hashrate: float, temperature: float):
+        self.n += 1
+        delta = hashrate - self.mean_h
+        self.mean_h += delta / self.n
+        self.m2_h += delta * (hashrate - self.mean_h)
+        self.mean_t += (temperature - self.mean_t) / self.n
+    
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2_h / self.n) if self.n else 0.0
+    
+    @property
+    def cv(self) -> float:
+        return self.std / self.mean_h if self.mean_h else 0.0
+
+class _SampleCollector:
+    """Background poller keeping a ring buffer of (ts, hashrate, temperature) samples"""
+    
+    def __init__(self, api: BitaxeAPI, interval: float = 5.0, maxlen: int = 120):
+        self.api = api
+        self.interval = interval
+        self._samples = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start polling in a daemon thread"""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="optimizer-sampler", daemon=True)
+        self._thread.start()
+    
+    def signal_stop(self):
+        """Ask the poller to stop and wake any waiting readers, without waiting for it"""
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+    
+    def stop(self):
+        """Stop polling and wait for the poller thread to exit"""
+        self.signal_stop()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 5)
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                status = self.api.get_mining_status(fresh=True)
+                if status:
+                    with self._cond:
+                        self._samples.append((time.monotonic(), status['hashrate'], status['temperature']))
+                        self._cond.notify_all()
+            except Exception as e:
+                logging.error(f"Error collecting optimizer sample: {e}")
+            self._stopped.wait(self.interval)
+    
+    def wait(self, seconds: float) -> bool:
+        """Sleep for `seconds`, returning True early if the collector was stopped"""
+        return self._stopped.wait(seconds)
+    
+    def get_window(self, seconds: float) -> List[tuple]:
+        """Samples taken within the last `seconds`, oldest first"""
+        cutoff = time.monotonic() - seconds
+        with self._cond:
+            return [s for s in self._samples if s[0] >= cutoff]
+    
+    def wait_newer(self, since: float, timeout: float) -> List[tuple]:
+        """Block until samples newer than `since` arrive (or `timeout`) and return them"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._stopped.is_set() or
+                                (self._samples and self._samples[-1][0] > since), timeout)
+            newer = []
+            for sample in reversed(self._samples):
+                if sample[0] <= since:
+                    break
+                newer.append(sample)
+        newer.reverse()
+        return newer
+
 class PerformanceOptimizer:
-    def __init__(self, api: BitaxeAPI, config: Config, database: Database = None):
+    def __init__(self, api: BitaxeAPI, config: Config, database: Database = None, notifier=None):
         self.api = api
         self.config = config
         self.database = database
         
         # Optimization parameters
         self.test_duration = 300  # 5 minutes per test
+        self.baseline_duration = 60
+        self.settle_time = 20
+        self.sample_interval = 5  # background sampler poll period
         self.stability_threshold = 0.95  # 95% stability required
-        self.max_temperature = config.get('optimization.target_temperature', 75)
-        self.min_improvement = config.get('optimization.min_hashrate_improvement', 5)
+        self._load_config(config)
+        config.on_reload(self._load_config)
         
         # Safety limits
         self.min_frequency = 400
@@ -48,9 +169,52 @@ class PerformanceOptimizer:
         self.frequency_steps = [400, 450, 500, 525, 550, 575, 600]
         self.voltage_steps = [1.0, 1.1, 1.15, 1.2, 1.25, 1.3, 1.35, 1.4]
         
+        self.search_timeout = 2 * 3600
+        self.frequency_step = 25
+        self.voltage_step = 0.05
+        
+        # Successive-halving test lengths for the grid sweep; the last rung is a full test
+        self.halving_rungs = [60, 150, self.test_duration]
+        
+        # Adaptive test length: stop once the 95% CI on mean hashrate is within
+        # min_improvement * precision_ratio percent, but never before min_test_duration
+        self.min_test_duration = 60
+        self.max_test_duration = 600
+        self.precision_ratio = 0.3
+        
+        # Early stopping inside a test: minimum samples before pruning, and the CV that counts as unstable
+        self.prune_min_samples = 6
+        self.prune_max_cv = 0.1
+        self._best_improvement = 0.0
+        
+        # Full-length test results keyed by (frequency, voltage), reused for a day on the same firmware
+        self.cache_ttl = 24 * 3600
+        self._result_cache: Dict[Tuple[int, float], Tuple[float, OptimizationResult]] = {}
+        self._cache_device = None  # api.base_url the in-memory results were measured on
+        self._firmware = None
+        self._cache_loaded = False
+        
         self.running = False
         self.current_test = None
+        self._collector: Optional[_SampleCollector] = None
+        self._applied: Optional[Tuple[int, float]] = None  # last settings a test applied
+        self._stop_event = threading.Event()  # set by stop_optimization to cut waits short
+        # The app's shared NotificationManager; without one, a private manager is created
+        # on the first alert and closed when that optimization run ends
+        self._notif = notifier
+        self._owns_notif = False
+        self._pending_results: List[Dict[str, Any]] = []
         
+    def _load_config(self, config: Config):
+        """Snapshot the optimization settings; re-run whenever the config reloads"""
+        self.max_temperature = config.get('optimization.target_temperature', 75)
+        self.min_improvement = config.get('optimization.min_hashrate_improvement', 5)
+        self._notify_on_found = config.get('notifications.email.alerts.optimal_settings_found', True)
+        
+        # Search policy: 'bayesian' (TPE, needs optuna), 'grid', or 'auto' to pick TPE when available
+        self.search_strategy = config.get('optimization.search_strategy', 'auto')
+        self.max_trials = config.get('optimization.max_trials', 15)
+    
     def optimize(self) -> Optional[OptimizationResult]:
         """Run complete optimization process"""
         if self.running:
@@ -58,14 +222,21 @@ class PerformanceOptimizer:
             return None
         
         self.running = True
+        self._stop_event.clear()
         logging.info("Starting performance optimization")
         
         try:
+            self._refresh_result_cache()
+            self._start_sampling()
+            
             # Get baseline performance
             baseline = self._get_baseline_performance()
             if not baseline:
                 logging.error("Failed to get baseline performance")
                 return None
+            if baseline['hashrate'] <= 0:
+                logging.error("Baseline hashrate is zero; is the miner idle or restarting?")
+                return None
             
             logging.info(f"Baseline: {baseline['hashrate']:.1f} GH/s at {baseline['temperature']:.1f}°C")
             
@@ -77,18 +248,13 @@ class PerformanceOptimizer:
                 self._apply_optimal_settings(best_result)
                 
                 # Send notification if enabled
-                if self.config.get('notifications.email.alerts.optimal_settings_found', True):
+                if self._notify_on_found:
                     try:
-                        from notifications import NotificationManager
-                        notif_manager = NotificationManager(self.config)
-                        notif_manager.send_optimization_alert(best_result.__dict__)
+                        self._get_notifier().send_optimization_alert(
+                            dict(best_result.__dict__, device=self.api.base_url))
                     except Exception as e:
                         logging.error(f"Failed to send optimization notification: {e}")
                 
-                # Store result in database
-                if self.database:
-                    self._store_optimization_result(best_result)
-                
                 logging.info(f"Optimization complete: {best_result.improvement_percent:.1f}% improvement")
                 return best_result
             else:
@@ -111,166 +277,431 @@ class PerformanceOptimizer:
             return None
         
         finally:
+            self._stop_sampling()
+            self._close_own_notifier()
             self.running = False
     
+    def _get_notifier(self):
+        """NotificationManager for optimization alerts: the one passed in, else the app's shared one"""
+        if self._notif is None:
+            from notifications import NotificationManager
+            shared = NotificationManager.shared()
+            if shared is not None:
+                return shared
+            self._notif = NotificationManager(self.config)
+            self._owns_notif = True
+        return self._notif
+    
+    def _close_own_notifier(self):
+        """Send and close a fallback NotificationManager this optimizer created itself"""
+        if not self._owns_notif:
+            return
+        notif, self._notif, self._owns_notif = self._notif, None, False
+        try:
+            notif.close()
+        except Exception as e:
+            logging.error(f"Error closing optimization notifier: {e}")
+    
+    def _start_sampling(self):
+        """Start the background sampler that tests and the baseline read from"""
+        self._collector = _SampleCollector(self.api, self.sample_interval,
+                                           maxlen=int(max(self.test_duration, self.baseline_duration)
+                                                      // self.sample_interval) + 10)
+        self._collector.start()
+    
+    def _stop_sampling(self):
+        collector, self._collector = self._collector, None
+        if collector:
+            collector.stop()
+    
+    def _refresh_result_cache(self):
+        """Load persisted test results, discarding them if the firmware has changed"""
+        # Read at use time: update_ip_address may have pointed the API at another device
+        device = self.api.base_url
+        info = self.api.get_system_info()
+        firmware = info.get('version') if info else None
+        if firmware is None and device == self._cache_device:
+            firmware = self._firmware  # transient failure; assume the firmware is unchanged
+        
+        if firmware is None:
+            # Clearing with an unknown firmware would delete every persisted result for the device
+            logging.warning("Firmware version unknown, not loading persisted test results")
+            if device != self._cache_device:
+                self._result_cache = {}
+                self._cache_device = device
+                self._firmware = None
+                self._cache_loaded = False
+            return
+        
+        if self._cache_loaded and device == self._cache_device and firmware == self._firmware:
+            return
+        
+        if self._cache_loaded and device == self._cache_device:
+            logging.info(f"Firmware changed ({self._firmware} -> {firmware}), discarding cached test results")
+        self._cache_device = device
+        self._firmware = firmware
+        self._result_cache = {}
+        self._cache_loaded = True
+        
+        if self.database:
+            self.database.clear_optimization_cache(device, keep_firmware=firmware)
+            for row in self.database.get_optimization_cache(device, firmware, self.cache_ttl):
+                result = OptimizationResult(
+                    frequency=row['frequency'],
+                    voltage=row['voltage'],
+                    hashrate_before=0,
+                    hashrate_after=row['hashrate'],
+                    temperature_before=0,
+                    temperature_after=row['temperature'],
+                    improvement_percent=0,
+                    success=False,
+                    test_duration=self.test_duration,
+                    stability_score=row['stability']
+                )
+                self._result_cache[(row['frequency'], round(row['voltage'], 2))] = (row['ts'], result)
+            if self._result_cache:
+                logging.info(f"Loaded {len(self._result_cache)} cached test results")
+    
+    def _cached_result(self, frequency: int, voltage: float,
+                       base: BaselineStats) -> Optional[OptimizationResult]:
+        """Return a fresh cached result for these settings, re-scored against `base`"""
+        entry = self._result_cache.get((frequency, round(voltage, 2)))
+        if not entry or time.time() - entry[0] >= self.cache_ttl:
+            return None
+        
+        result = entry[1]
+        improvement_percent = (result.hashrate_after - base.hashrate) * base.inv_hashrate * 100
+        return replace(result,
+                       hashrate_before=base.hashrate,
+                       temperature_before=base.temperature,
+                       improvement_percent=improvement_percent,
+                       success=improvement_percent >= self.min_improvement)
+    
+    def _cache_result(self, result: OptimizationResult):
+        """Remember a full-length test result in memory and in the database"""
+        now = time.time()
+        self._result_cache[(result.frequency, round(result.voltage, 2))] = (now, result)
+        # Results measured on unknown firmware are only kept in memory
+        if self.database and self._firmware is not None:
+            self.database.save_optimization_cache({
+                'device': self._cache_device,
+                'frequency': result.frequency,
+                'voltage': round(result.voltage, 2),
+                'firmware': self._firmware,
+                'hashrate': result.hashrate_after,
+                'temperature': result.temperature_after,
+                'stability': result.stability_score,
+                'ts': now
+            })
+    
     def _get_baseline_performance(self) -> Optional[Dict[str, Any]]:
         """Get current performance baseline"""
         try:
-            # Collect data for baseline measurement
-            samples = []
-            sample_count = 12  # 1 minute of samples at 5s intervals
+            # The setpoints are known up front; samples only need to carry hashrate and temperature
+            settings = self.api.get_current_settings()
+            if not settings:
+                logging.error("Failed to read current settings for baseline")
+                return None
             
-            for i in range(sample_count):
-                status = self.api.get_mining_status()
-                if status:
-                    samples.append(status)
-                    time.sleep(5)
-                else:
-                    logging.warning(f"Failed to get status for baseline sample {i+1}")
+            # Let the background sampler fill one baseline window
+            collector = self._collector
+            sample_count = int(self.baseline_duration // collector.interval)
+            collector.wait(self.baseline_duration)
+            window = collector.get_window(self.baseline_duration)
             
-            if len(samples) < sample_count // 2:
+            if len(window) < sample_count // 2:
                 logging.error("Insufficient samples for baseline")
                 return None
             
-            # Calculate averages
-            avg_hashrate = sum(s['hashrate'] for s in samples) / len(samples)
-            avg_temperature = sum(s['temperature'] for s in samples) / len(samples)
-            
-            # Get current settings
-            current_freq = samples[-1]['frequency']
-            current_voltage = samples[-1]['voltage']
+            stats = RunningStats()
+            for _, hashrate, temperature in window:
+                stats.push(hashrate, temperature)
             
             return {
-                'hashrate': avg_hashrate,
-                'temperature': avg_temperature,
-                'frequency': current_freq,
-                'voltage': current_voltage,
-                'samples': len(samples),
-                'stability': self._calculate_stability(samples)
+                'hashrate': stats.mean_h,
+                'temperature': stats.mean_t,
+                'frequency': settings['frequency'],
+                'voltage': settings['voltage'],
+                'samples': stats.n,
+                'stability': self._calculate_stability(stats)
             }
         
         except Exception as e:
             logging.error(f"Error getting baseline performance: {e}")
             return None
     
+    def _score(self, result: OptimizationResult) -> float:
+        """Overall score: hashrate improvement weighted by temperature"""
+        temp_penalty = max(0, (result.temperature_after - self.max_temperature) * 0.1)
+        return result.improvement_percent - temp_penalty
+    
+    def _use_bayesian_search(self) -> bool:
+        """Whether to search with TPE instead of sweeping the grid"""
+        if self.search_strategy == 'grid':
+            return False
+        if optuna is None:
+            if self.search_strategy == 'bayesian':
+                logging.warning("optuna is not installed, falling back to grid search")
+            return False
+        return True
+    
     def _find_optimal_settings(self, baseline: Dict[str, Any]) -> Optional[OptimizationResult]:
         """Find optimal frequency and voltage combination"""
-        best_result = None
-        best_score = 0
+        self._best_improvement = 0.0
+        self._applied = None
+        base = BaselineStats.from_baseline(baseline, self.min_improvement)
+        try:
+            if self._use_bayesian_search():
+                best_result = self._bayesian_search(base)
+            else:
+                best_result = self._grid_search(base)
+        finally:
+            # Every measured combination goes to the history, not just the winner
+            self._flush_results()
         
-        # Generate test combinations
-        test_combinations = self._generate_test_combinations()
+        # Restore baseline settings if no improvement found
+        if not best_result:
+            self.api.set_frequency(baseline['frequency'])
+            self.api.set_voltage(baseline['voltage'])
+            time.sleep(10)  # Allow settings to settle
         
-        logging.info(f"Testing {len(test_combinations)} frequency/voltage combinations")
+        return best_result
+    
+    def _bayesian_search(self, base: BaselineStats) -> Optional[OptimizationResult]:
+        """Pick each next combination with a TPE model of score over (frequency, voltage)"""
+        best = {'score': 0, 'result': None}
+        tested: Dict[Tuple[int, float], float] = {}
         
-        for i, (freq, voltage) in enumerate(test_combinations):
+        def objective(trial):
             if not self.running:
-                break
+                trial.study.stop()
+                raise optuna.TrialPruned()
             
-            logging.info(f"Testing combination {i+1}/{len(test_combinations)}: {freq}MHz, {voltage:.2f}V")
+            freq = trial.suggest_int('freq', self.min_frequency, self.max_frequency, step=self.frequency_step)
+            voltage = round(trial.suggest_float('voltage', self.min_voltage, self.max_voltage,
+                                                step=self.voltage_step), 2)
             
-            # Test this combination
-            result = self._test_settings(freq, voltage, baseline)
+            # Unsafe points are pruned rather than scored so the sampler learns the feasible region
+            if not self._is_safe_combination(freq, voltage):
+                raise optuna.TrialPruned()
+            if (freq, voltage) in tested:
+                return tested[(freq, voltage)]
             
-            if result and result.success:
-                # Calculate overall score (hashrate improvement weighted by temperature)
-                temp_penalty = max(0, (result.temperature_after - self.max_temperature) * 0.1)
-                score = result.improvement_percent - temp_penalty
-                
-                if score > best_score and score >= self.min_improvement:
-                    best_score = score
-                    best_result = result
+            logging.info(f"Testing trial {trial.number + 1}/{self.max_trials}: {freq}MHz, {voltage:.2f}V")
+            result = self._test_settings(freq, voltage, base)
+            if not result:
+                score = -100.0
+            else:
+                score = self._score(result)
+                if result.success and score > best['score'] and score >= self.min_improvement:
+                    best['score'] = score
+                    best['result'] = result
+                    self._best_improvement = result.improvement_percent
                     logging.info(f"New best result: {score:.1f} score, {result.improvement_percent:.1f}% improvement")
+            
+            tested[(freq, voltage)] = score
+            return score
         
-        # Restore baseline settings if no improvement found
-        if not best_result:
-            self.api.set_frequency(baseline['frequency'])
-            self.api.set_voltage(baseline['voltage'])
-            time.sleep(10)  # Allow settings to settle
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(direction='maximize', sampler=optuna.samplers.TPESampler())
+        logging.info(f"Searching up to {self.max_trials} frequency/voltage combinations with TPE")
+        study.optimize(objective, n_trials=self.max_trials, timeout=self.search_timeout)
+        
+        return best['result']
+    
+    def _grid_search(self, base: BaselineStats) -> Optional[OptimizationResult]:
+        """Sweep the safe grid with successive halving: short tests for all, longer ones for the best half"""
+        best_result = None
+        best_score = 0
+        
+        # Generate test combinations
+        survivors = self._generate_test_combinations()
+        
+        # Samples per combination carry over between rungs, so each rung only tops them up
+        samples: Dict[Tuple[int, float], RunningStats] = {}
+        
+        logging.info(f"Testing {len(survivors)} frequency/voltage combinations")
+        
+        for rung, duration in enumerate(self.halving_rungs, 1):
+            last_rung = rung == len(self.halving_rungs)
+            scored = []
+            
+            # Walk the rung as a short path so consecutive tests need little settling
+            survivors = self._nearest_neighbor_order(survivors, self._applied or (base.frequency, base.voltage))
+            
+            for i, (freq, voltage) in enumerate(survivors):
+                if not self.running:
+                    return best_result
+                
+                logging.info(f"Rung {rung} ({duration}s), combination {i+1}/{len(survivors)}: {freq}MHz, {voltage:.2f}V")
+                
+                # Test this combination
+                result = self._test_settings(freq, voltage, base, duration=duration,
+                                             prior_samples=samples.setdefault((freq, voltage), RunningStats()))
+                if result:
+                    scored.append((self._score(result), freq, voltage, result))
+            
+            scored.sort(key=lambda entry: entry[0], reverse=True)
+            
+            if last_rung:
+                # Only combinations that survived to the full-length test can become the result
+                for score, _, _, result in scored:
+                    if result.success and score > best_score and score >= self.min_improvement:
+                        best_score = score
+                        best_result = result
+                        self._best_improvement = result.improvement_percent
+                        logging.info(f"New best result: {score:.1f} score, {result.improvement_percent:.1f}% improvement")
+            else:
+                survivors = [(freq, voltage) for _, freq, voltage, _ in scored[:(len(scored) + 1) // 2]]
+                logging.info(f"Rung {rung} complete, {len(survivors)} combinations advance")
+                if not survivors:
+                    break
         
         return best_result
     
+    def _step_distance(self, a: Tuple[int, float], b: Tuple[int, float]) -> float:
+        """Chebyshev distance between two settings, in frequency/voltage grid steps"""
+        return max(abs(a[0] - b[0]) / self.frequency_step, abs(a[1] - b[1]) / self.voltage_step)
+    
+    def _nearest_neighbor_order(self, combinations: List[Tuple[int, float]],
+                                start: Tuple[int, float]) -> List[Tuple[int, float]]:
+        """Order combinations as a greedy path from `start`, always hopping to the closest one left"""
+        remaining = list(combinations)
+        path = []
+        current = start
+        while remaining:
+            current = min(remaining, key=lambda c: self._step_distance(current, c))
+            remaining.remove(current)
+            path.append(current)
+        return path
+    
+    def _settle_time(self, frequency: int, voltage: float) -> float:
+        """Stabilization wait, scaled down when the previous test's settings were close"""
+        if self._applied is None:
+            return self.settle_time
+        steps = self._step_distance(self._applied, (frequency, voltage))
+        return min(self.settle_time, 5 + 7.5 * steps)
+    
     def _generate_test_combinations(self) -> List[Tuple[int, float]]:
         """Generate smart test combinations based on expected performance"""
-        combinations = []
-        
-        # Start with conservative settings and gradually increase
-        for freq in self.frequency_steps:
-            for voltage in self.voltage_steps:
-                # Skip unsafe combinations
-                if self._is_safe_combination(freq, voltage):
-                    combinations.append((freq, voltage))
+        # Evaluate the safety rules over the whole frequency x voltage grid at once. The step
+        # lists are ascending, so a reversed 'ij' grid already yields the expected-performance
+        # order (higher frequency first, then higher voltage) without sorting
+        F, V = np.meshgrid(np.array(self.frequency_steps[::-1]), np.array(self.voltage_steps[::-1]),
+                           indexing='ij')
+        mask = self._safe_mask(F, V)
         
-        # Sort by expected performance (higher frequency first, then higher voltage)
-        combinations.sort(key=lambda x: (x[0], x[1]), reverse=True)
-        
-        return combinations
+        return list(zip(F[mask].tolist(), V[mask].tolist()))
+    
+    def _safe_mask(self, frequency, voltage) -> np.ndarray:
+        """Elementwise safety check for frequency/voltage scalars or arrays"""
+        F, V = np.asarray(frequency), np.asarray(voltage)
+        return ((F >= self.min_frequency) & (F <= self.max_frequency) &
+                (V >= self.min_voltage) & (V <= self.max_voltage) &
+                # Conservative voltage limits for high frequencies
+                ~((F >= 575) & (V > 1.3)) &
+                ~((F >= 550) & (V > 1.35)))
     
     def _is_safe_combination(self, frequency: int, voltage: float) -> bool:
         """Check if frequency/voltage combination is safe"""
-        # Basic safety checks
-        if frequency < self.min_frequency or frequency > self.max_frequency:
-            return False
-        
-        if voltage < self.min_voltage or voltage > self.max_voltage:
-            return False
+        return bool(self._safe_mask(frequency, voltage))
+    
+    def _test_settings(self, frequency: int, voltage: float, base: BaselineStats,
+                       duration: Optional[int] = None,
+                       prior_samples: Optional[RunningStats] = None) -> Optional[OptimizationResult]:
+        """Test specific frequency and voltage settings for about `duration` seconds
         
-        # Conservative voltage limits for high frequencies
-        if frequency >= 575 and voltage > 1.3:
-            return False
+        Sampling stops early once the mean hashrate is known precisely enough, and a
+        full-length test of a noisy candidate may run on up to `max_test_duration`.
+        New samples are pushed into `prior_samples` when given, so a longer follow-up
+        test of the same settings only collects the difference.
+        """
+        duration = duration or self.test_duration
         
-        if frequency >= 550 and voltage > 1.35:
-            return False
+        cached = self._cached_result(frequency, voltage, base)
+        if cached:
+            logging.info(f"Using cached result for {frequency}MHz, {voltage:.2f}V: "
+                         f"{cached.improvement_percent:.1f}% improvement")
+            return cached
         
-        return True
-    
-    def _test_settings(self, frequency: int, voltage: float, baseline: Dict[str, Any]) -> Optional[OptimizationResult]:
-        """Test specific frequency and voltage settings"""
         try:
             self.current_test = f"{frequency}MHz, {voltage:.2f}V"
             
-            # Apply settings
-            if not self.api.set_frequency(frequency):
-                logging.error(f"Failed to set frequency to {frequency}")
-                return None
-            
-            time.sleep(2)
+            stats = prior_samples if prior_samples is not None else RunningStats()
             
-            if not self.api.set_voltage(voltage):
-                logging.error(f"Failed to set voltage to {voltage}")
-                return None
+            # Samples carried over from a shorter rung may already pin the mean down
+            precise = self._is_precise(stats, base)
+            if not precise:
+                settle = self._settle_time(frequency, voltage)
+                previous, self._applied = self._applied, None
+                
+                # Apply settings, skipping a frequency write (and its pause) when only voltage changes
+                if not previous or previous[0] != frequency:
+                    if not self.api.set_frequency(frequency):
+                        logging.error(f"Failed to set frequency to {frequency}")
+                        return None
+                    
+                    time.sleep(2)
+                
+                if not self.api.set_voltage(voltage):
+                    logging.error(f"Failed to set voltage to {voltage}")
+                    return None
+                self._applied = (frequency, voltage)
+                
+                # Wait for settings to stabilize
+                if self._stop_event.wait(settle):
+                    return None
             
-            # Wait for settings to stabilize
-            time.sleep(30)
+            # Performance data comes from the background sampler
+            collector = self._collector
+            sample_interval = collector.interval
+            total_samples = int(duration // sample_interval)
+            max_samples = total_samples
+            if duration >= self.test_duration:
+                max_samples = int(max(duration, self.max_test_duration) // sample_interval)
             
-            # Collect performance data
-            samples = []
-            sample_interval = 10  # 10 seconds between samples
-            total_samples = self.test_duration // sample_interval
+            # A candidate has to beat both the minimum improvement and the best result so far
+            prune_below = max(base.plus_min, base.hashrate * (1 + self._best_improvement / 100))
             
-            for i in range(total_samples):
-                if not self.running:
+            # Wake on each new sample until the window is full; one interval of slack
+            # covers poll jitter
+            since = time.monotonic()
+            deadline = since + (max_samples - stats.n + 1) * sample_interval
+            while not precise and stats.n < max_samples and self.running:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
                     break
                 
-                status = self.api.get_mining_status()
-                if status:
-                    samples.append(status)
+                for since, hashrate, temperature in collector.wait_newer(since, timeout):
+                    if stats.n == max_samples:
+                        break
+                    stats.push(hashrate, temperature)
                     
                     # Safety check - abort if temperature too high
-                    if status['temperature'] > self.max_temperature + 10:
-                        logging.warning(f"Temperature too high ({status['temperature']:.1f}°C), aborting test")
+                    if temperature > self.max_temperature + 10:
+                        logging.warning(f"Temperature too high ({temperature:.1f}°C), aborting test")
                         return None
-                
-                time.sleep(sample_interval)
+                    
+                    if stats.n >= self.prune_min_samples:
+                        if stats.mean_h + 2 * stats.std / math.sqrt(stats.n) < prune_below:
+                            logging.info(f"Test pruned after {stats.n} samples: {stats.mean_h:.1f} GH/s cannot reach {prune_below:.1f} GH/s")
+                            return None
+                        if stats.cv > self.prune_max_cv:
+                            logging.info(f"Test pruned after {stats.n} samples: hashrate CV {stats.cv:.2f} too high")
+                            return None
+                    
+                    if self._is_precise(stats, base):
+                        precise = True
+                        break
             
-            if len(samples) < total_samples // 2:
+            if not precise and stats.n < total_samples // 2:
                 logging.warning("Insufficient samples for test")
                 return None
             
             # Calculate results
-            avg_hashrate = sum(s['hashrate'] for s in samples) / len(samples)
-            avg_temperature = sum(s['temperature'] for s in samples) / len(samples)
-            stability = self._calculate_stability(samples)
+            avg_hashrate = stats.mean_h
+            avg_temperature = stats.mean_t
+            stability = self._calculate_stability(stats)
             
             # Check if results are valid
             if stability < self.stability_threshold:
@@ -282,23 +713,28 @@ class PerformanceOptimizer:
                 return None
             
             # Calculate improvement
-            improvement_percent = ((avg_hashrate - baseline['hashrate']) / baseline['hashrate']) * 100
+            improvement_percent = (avg_hashrate - base.hashrate) * base.inv_hashrate * 100
             
             result = OptimizationResult(
                 frequency=frequency,
                 voltage=voltage,
-                hashrate_before=baseline['hashrate'],
+                hashrate_before=base.hashrate,
                 hashrate_after=avg_hashrate,
-                temperature_before=baseline['temperature'],
+                temperature_before=base.temperature,
                 temperature_after=avg_temperature,
                 improvement_percent=improvement_percent,
                 success=improvement_percent >= self.min_improvement,
-                test_duration=len(samples) * sample_interval,
+                test_duration=int(stats.n * sample_interval),
                 stability_score=stability
             )
             
             logging.info(f"Test result: {improvement_percent:.1f}% improvement, {avg_temperature:.1f}°C, {stability:.2f} stability")
             
+            # Short successive-halving rungs are too noisy to reuse or record
+            if duration >= self.test_duration:
+                self._cache_result(result)
+                self._record_result(result)
+            
             return result
         
         except Exception as e:
@@ -308,26 +744,20 @@ class PerformanceOptimizer:
         finally:
             self.current_test = None
     
-    def _calculate_stability(self, samples: List[Dict[str, Any]]) -> float:
+    def _is_precise(self, stats: RunningStats, base: BaselineStats) -> bool:
+        """Whether the samples pin mean hashrate down well enough to end the test"""
+        if stats.n < 2 or stats.n * self.sample_interval < self.min_test_duration:
+            return False
+        sem = stats.std / math.sqrt(stats.n)
+        return 1.96 * sem * base.inv_hashrate * 100 < self.min_improvement * self.precision_ratio
+    
+    def _calculate_stability(self, stats: RunningStats) -> float:
         """Calculate stability score based on hashrate variance"""
-        if len(samples) < 2:
+        if stats.n < 2 or stats.mean_h == 0:
             return 0.0
         
-        hashrates = [s['hashrate'] for s in samples]
-        avg_hashrate = sum(hashrates) / len(hashrates)
-        
-        if avg_hashrate == 0:
-            return 0.0
-        
-        # Calculate coefficient of variation (lower is more stable)
-        variance = sum((h - avg_hashrate) ** 2 for h in hashrates) / len(hashrates)
-        std_dev = variance ** 0.5
-        cv = std_dev / avg_hashrate
-        
-        # Convert to stability score (0-1, higher is more stable)
-        stability = max(0, 1 - cv * 10)  # Scale coefficient of variation
-        
-        return min(1.0, stability)
+        # Coefficient of variation (lower is more stable), scaled to a 0-1 score
+        return min(1.0, max(0.0, 1 - stats.cv * 10))
     
     def _apply_optimal_settings(self, result: OptimizationResult):
         """Apply the optimal settings found"""
@@ -342,7 +772,7 @@ class PerformanceOptimizer:
             time.sleep(30)
             
             # Verify settings applied correctly
-            status = self.api.get_mining_status()
+            status = self.api.get_mining_status(fresh=True)
             if status:
                 actual_freq = status.get('frequency', 0)
                 actual_voltage = status.get('voltage', 0)
@@ -355,28 +785,44 @@ class PerformanceOptimizer:
         except Exception as e:
             logging.error(f"Error applying optimal settings: {e}")
     
-    def _store_optimization_result(self, result: OptimizationResult):
-        """Store optimization result in database"""
+    def _record_result(self, result: OptimizationResult):
+        """Queue a measured result for the optimization history"""
+        self._pending_results.append({
+            'frequency': result.frequency,
+            'voltage': result.voltage,
+            'hashrate_before': result.hashrate_before,
+            'hashrate_after': result.hashrate_after,
+            'temperature_before': result.temperature_before,
+            'temperature_after': result.temperature_after,
+            'improvement_percent': result.improvement_percent,
+            'success': result.success
+        })
+    
+    def _flush_results(self):
+        """Write queued history rows in a single batch"""
+        pending, self._pending_results = self._pending_results, []
         try:
-            if self.database:
-                self.database.database.insert_optimization_history({
-                    'frequency': result.frequency,
-                    'voltage': result.voltage,
-                    'hashrate_before': result.hashrate_before,
-                    'hashrate_after': result.hashrate_after,
-                    'temperature_before': result.temperature_before,
-                    'temperature_after': result.temperature_after,
-                    'improvement_percent': result.improvement_percent,
-                    'success': result.success
-                })
+            if self.database and pending:
+                self.database.insert_optimization_history_batch(pending)
         except Exception as e:
-            logging.error(f"Error storing optimization result: {e}")
+            logging.error(f"Error storing optimization results: {e}")
     
     def stop_optimization(self):
         """Stop the optimization process"""
         self.running = False
+        self._stop_event.set()
+        # Only signal here: this usually runs on the GUI thread, and the join happens in
+        # _stop_sampling on the optimizer's own thread
+        collector = self._collector
+        if collector:
+            collector.signal_stop()
         logging.info("Optimization stop requested")
     
+    def close(self):
+        """Stop following config reloads and close a NotificationManager we created"""
+        self.config.off_reload(self._load_config)
+        self._close_own_notifier()
+    
     def get_optimization_status(self) -> Dict[str, Any]:
         """Get current optimization status"""
         return {
@@ -393,34 +839,60 @@ class PerformanceOptimizer:
             return None
         
         self.running = True
+        self._stop_event.clear()
         
         try:
+            self._refresh_result_cache()
+            self._start_sampling()
+            
             baseline = self._get_baseline_performance()
             if not baseline:
                 return None
+            if baseline['hashrate'] <= 0:
+                logging.error("Baseline hashrate is zero; is the miner idle or restarting?")
+                return None
             
             # If no target specified, aim for 10% improvement
             if target_hashrate is None:
                 target_hashrate = baseline['hashrate'] * 1.1
+            base = BaselineStats.from_baseline(baseline, self.min_improvement)
+            self._applied = None
             
             # Test a few promising combinations
             quick_combinations = [
                 (525, 1.2), (550, 1.25), (500, 1.15), (575, 1.3)
             ]
             
+            # Combinations with a cached result cost nothing to check and are ordered by how close
+            # they came to the target; untested ones follow in their original order
+            now = time.time()
+            
+            def predicted(combination):
+                entry = self._result_cache.get(combination)
+                if entry and now - entry[0] < self.cache_ttl:
+                    return (0, abs(entry[1].hashrate_after - target_hashrate))
+                return (1, 0)
+            
+            quick_combinations.sort(key=predicted)
+            
             best_result = None
             best_distance = float('inf')
+            target_tol = target_hashrate * 0.02
             
             for freq, voltage in quick_combinations:
                 if not self._is_safe_combination(freq, voltage):
                     continue
                 
-                result = self._test_settings(freq, voltage, baseline)
+                result = self._test_settings(freq, voltage, base)
                 if result and result.success:
                     distance = abs(result.hashrate_after - target_hashrate)
                     if distance < best_distance:
                         best_distance = distance
                         best_result = result
+                    
+                    # Close enough to the target; no need to test the rest
+                    if best_distance < target_tol:
+                        break
             
             if best_result:
                 self._apply_optimal_settings(best_result)
@@ -429,8 +901,43 @@ class PerformanceOptimizer:
             return None
         
         finally:
+            self._flush_results()
+            self._stop_sampling()
             self.running = False
 
+class FleetOptimizer:
+    """Optimize several Bitaxe units in parallel, one PerformanceOptimizer per device"""
+    
+    def __init__(self, apis: List[BitaxeAPI], config: Config, database: Database = None,
+                 notifier=None):
+        # Units share the caller's NotificationManager; alerts are keyed per device so none is dropped
+        self.optimizers = [PerformanceOptimizer(api, config, database, notifier) for api in apis]
+    
+    def optimize(self) -> List[Optional[OptimizationResult]]:
+        """Run optimize() on every unit at once; results are in the same order as `apis`"""
+        if not self.optimizers:
+            return []
+        
+        # Each unit only waits on its own device I/O, so one thread per unit runs them side by side
+        with ThreadPoolExecutor(max_workers=len(self.optimizers),
+                                thread_name_prefix="fleet-optimizer") as pool:
+            return list(pool.map(lambda optimizer: optimizer.optimize(), self.optimizers))
+    
+    def stop_optimization(self):
+        """Stop the optimization on every unit"""
+        for optimizer in self.optimizers:
+            optimizer.stop_optimization()
+    
+    def close(self):
+        """Release every unit's optimizer"""
+        for optimizer in self.optimizers:
+            optimizer.close()
+    
+    def get_optimization_status(self) -> List[Dict[str, Any]]:
+        """Get the optimization status of every unit"""
+        return [dict(optimizer.get_optimization_status(), device=optimizer.api.base_url)
+                for optimizer in self.optimizers]
+
 class AutoOptimizer:
     """Automatic optimization scheduler"""
     
@@ -439,12 +946,22 @@ class AutoOptimizer:
         self.config = config
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()
         
         # Auto optimization settings
         self.check_interval = 3600  # Check every hour
         self.min_runtime_hours = 24  # Minimum runtime before optimization
         self.performance_threshold = 5  # % drop threshold for re-optimization
         
+        # The week-long average moves slowly, so it is only re-queried hourly
+        self.history_cache_ttl = 3600
+        self._hist_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._load_config(config)
+    
+    def _load_config(self, config: Config):
+        """Snapshot the settings the scheduler checks; re-run whenever the config reloads"""
+        self._target_temp = config.get('optimization.target_temperature', 75)
+        
     def start(self):
         """Start automatic optimization"""
         if self.running:
@@ -454,7 +971,12 @@ class AutoOptimizer:
             logging.info("Auto optimization disabled in config")
             return
         
+        # Follow config changes only while running; stop() unregisters
+        self._load_config(self.config)
+        self.config.on_reload(self._load_config)
+        
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._auto_optimize_loop, daemon=True)
         self.thread.start()
         
@@ -463,6 +985,10 @@ class AutoOptimizer:
     def stop(self):
         """Stop automatic optimization"""
         self.running = False
+        self._stop_event.set()
+        self.config.off_reload(self._load_config)
+        if self.optimizer.running:
+            self.optimizer.stop_optimization()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
         
@@ -491,32 +1017,41 @@ class AutoOptimizer:
                             logging.info("Auto optimization found no improvements")
                             last_optimization = current_time
                 
-                # Sleep until next check
-                time.sleep(self.check_interval)
+                # Sleep until next check; stop() wakes this immediately
+                if self._stop_event.wait(self.check_interval):
+                    return
                 
             except Exception as e:
                 logging.error(f"Error in auto optimization loop: {e}")
-                time.sleep(self.check_interval)
+                if self._stop_event.wait(self.check_interval):
+                    return
+    
+    def _historical_stats(self) -> Dict[str, Any]:
+        """One-week averages, cached for `history_cache_ttl` seconds"""
+        now = time.monotonic()
+        if self._hist_cache is None or now - self._hist_cache[0] >= self.history_cache_ttl:
+            self._hist_cache = (now, self.optimizer.database.get_average_stats(hours=168))
+        return self._hist_cache[1]
     
     def _should_optimize(self) -> bool:
         """Determine if optimization should be run"""
         try:
             # Get recent performance data
             if hasattr(self.optimizer, 'database') and self.optimizer.database:
-                recent_data = self.optimizer.database.get_recent_data(hours=6)
+                recent = self.optimizer.database.get_average_stats(hours=6)
                 
-                if len(recent_data) < 10:
+                if recent['count'] < 10:
                     return False  # Not enough data
                 
-                # Calculate average recent performance
-                recent_hashrate = sum(d['hashrate'] for d in recent_data) / len(recent_data)
-                recent_temperature = sum(d['temperature'] for d in recent_data) / len(recent_data)
+                # Average recent performance
+                recent_hashrate = recent['avg_hashrate']
+                recent_temperature = recent['avg_temperature']
                 
                 # Get historical average for comparison
-                historical_data = self.optimizer.database.get_recent_data(hours=168)  # 1 week
+                historical = self._historical_stats()
                 
-                if len(historical_data) > 100:
-                    historical_hashrate = sum(d['hashrate'] for d in historical_data) / len(historical_data)
+                if historical['count'] > 100 and historical['avg_hashrate']:
+                    historical_hashrate = historical['avg_hashrate']
                     
                     # Check for performance degradation
                     performance_drop = ((historical_hashrate - recent_hashrate) / historical_hashrate) * 100
@@ -526,7 +1061,7 @@ class AutoOptimizer:
                         return True
                 
                 # Check for high temperature issues
-                if recent_temperature > self.config.get('optimization.target_temperature', 75) + 5:
+                if recent_temperature > self._target_temp + 5:
                     logging.info(f"High temperature detected: {recent_temperature:.1f}°C")
                     return True
             
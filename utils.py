@@ -4,19 +4,64 @@ Data processing, validation, and helper functions
 """
 
 import re
+import csv
+import math
 import json
+import time
 import logging
 import hashlib
+import shutil
 import socket
-import subprocess
+import tempfile
 import platform
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlsplit
 import ipaddress
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; calculate_statistics falls back to NumPy
+    njit = None
+
+# Bitcoin mining calculations (simplified): 144 blocks per day at a 6.25 BTC reward
+_DAILY_BTC_REWARD = 144 * 6.25
+
+# Shared pooled session for device verification; sized to the scan's worker count
+_HTTP = requests.Session()
+_HTTP.mount('http://', HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0))
+
+# The routed local address only changes with DHCP/route updates, so it is re-resolved once a minute
+_LOCAL_IP_TTL = 60
+_local_ip_cache: Optional[Tuple[float, str]] = None
+
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_IPV4_RE = re.compile(r'\d{1,3}(?:\.\d{1,3}){3}')
+
+# Unit tables for the formatters: bisect_right(thresholds, value) indexes the
+# (divisor, unit) entry, so each threshold is the smallest value shown in the next unit
+_HASHRATE_THRESHOLDS = (0.001, 1, 1000)
+_HASHRATE_UNITS = ((1e-6, 'KH/s'), (1e-3, 'MH/s'), (1, 'GH/s'), (1000, 'TH/s'))
+_POWER_THRESHOLDS = (1000,)
+_POWER_UNITS = ((1, 'W'), (1000, 'kW'))
+_DIFFICULTY_THRESHOLDS = (1e3, 1e6, 1e9, 1e12)
+_DIFFICULTY_UNITS = ((1, ''), (1e3, 'K'), (1e6, 'M'), (1e9, 'G'), (1e12, 'T'))
+_BYTES_THRESHOLDS = tuple(1024.0 ** i for i in range(1, 6))
+_BYTES_UNITS = tuple((1024.0 ** i, unit) for i, unit in enumerate(['B', 'KB', 'MB', 'GB', 'TB', 'PB']))
 
 def validate_ip_address(ip: str) -> bool:
     """Validate IP address format"""
+    # Reject strings that can't be IPv4 or IPv6 without raising inside ipaddress
+    if isinstance(ip, str) and ':' not in ip and _IPV4_RE.fullmatch(ip) is None:
+        return False
     try:
         ipaddress.ip_address(ip)
         return True
@@ -33,8 +78,7 @@ def validate_port(port: Union[int, str]) -> bool:
 
 def validate_email(email: str) -> bool:
     """Validate email address format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.fullmatch(email) is not None
 
 def validate_frequency(frequency: Union[int, str]) -> bool:
     """Validate ASIC frequency value"""
@@ -52,23 +96,37 @@ def validate_voltage(voltage: Union[float, str]) -> bool:
     except (ValueError, TypeError):
         return False
 
+def _range_mask(values, dtype, low, high, validate_one) -> np.ndarray:
+    """Boolean mask of values within [low, high]; falls back per element if the batch won't convert"""
+    arr = np.asarray(values)
+    try:
+        converted = arr.astype(dtype)
+    except (ValueError, TypeError):
+        # Mixed or partly invalid input: fall back to the scalar validator for each element
+        return np.fromiter((validate_one(v) for v in arr), dtype=bool, count=arr.size)
+    return (converted >= low) & (converted <= high)
+
+def validate_port_array(ports) -> np.ndarray:
+    """Validate a 1-D batch of port numbers, returning a boolean mask"""
+    return _range_mask(ports, np.int64, 1, 65535, validate_port)
+
+def validate_frequency_array(frequencies) -> np.ndarray:
+    """Validate a 1-D batch of ASIC frequencies, returning a boolean mask"""
+    return _range_mask(frequencies, np.int64, 200, 800, validate_frequency)
+
+def validate_voltage_array(voltages) -> np.ndarray:
+    """Validate a 1-D batch of ASIC voltages, returning a boolean mask"""
+    return _range_mask(voltages, np.float64, 0.8, 1.6, validate_voltage)
+
 def format_hashrate(hashrate: float, precision: int = 1) -> str:
     """Format hashrate with appropriate units"""
-    if hashrate >= 1000:
-        return f"{hashrate / 1000:.{precision}f} TH/s"
-    elif hashrate >= 1:
-        return f"{hashrate:.{precision}f} GH/s"
-    elif hashrate >= 0.001:
-        return f"{hashrate * 1000:.{precision}f} MH/s"
-    else:
-        return f"{hashrate * 1000000:.{precision}f} KH/s"
+    divisor, unit = _HASHRATE_UNITS[bisect_right(_HASHRATE_THRESHOLDS, hashrate)]
+    return "%.*f %s" % (precision, hashrate / divisor, unit)
 
 def format_power(power: float, precision: int = 1) -> str:
     """Format power consumption with appropriate units"""
-    if power >= 1000:
-        return f"{power / 1000:.{precision}f} kW"
-    else:
-        return f"{power:.{precision}f} W"
+    divisor, unit = _POWER_UNITS[bisect_right(_POWER_THRESHOLDS, power)]
+    return "%.*f %s" % (precision, power / divisor, unit)
 
 def format_temperature(temp: float, unit: str = 'C', precision: int = 1) -> str:
     """Format temperature with unit"""
@@ -82,31 +140,22 @@ def format_uptime(seconds: int) -> str:
     """Format uptime in human readable format"""
     if seconds < 60:
         return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
+    minutes, remaining_seconds = divmod(seconds, 60)
+    if minutes < 60:
         return f"{minutes}m {remaining_seconds}s"
-    elif seconds < 86400:
-        hours = seconds // 3600
-        remaining_minutes = (seconds % 3600) // 60
+    hours, remaining_minutes = divmod(minutes, 60)
+    if hours < 24:
         return f"{hours}h {remaining_minutes}m"
-    else:
-        days = seconds // 86400
-        remaining_hours = (seconds % 86400) // 3600
-        return f"{days}d {remaining_hours}h"
+    days, remaining_hours = divmod(hours, 24)
+    return f"{days}d {remaining_hours}h"
 
 def format_difficulty(difficulty: float) -> str:
     """Format mining difficulty with appropriate units"""
-    if difficulty >= 1e12:
-        return f"{difficulty / 1e12:.2f}T"
-    elif difficulty >= 1e9:
-        return f"{difficulty / 1e9:.2f}G"
-    elif difficulty >= 1e6:
-        return f"{difficulty / 1e6:.2f}M"
-    elif difficulty >= 1e3:
-        return f"{difficulty / 1e3:.2f}K"
-    else:
-        return f"{difficulty:.0f}"
+    i = bisect_right(_DIFFICULTY_THRESHOLDS, difficulty)
+    if i == 0:
+        return "%.0f" % difficulty
+    divisor, unit = _DIFFICULTY_UNITS[i]
+    return "%.2f%s" % (difficulty / divisor, unit)
 
 def calculate_efficiency(hashrate: float, power: float) -> float:
     """Calculate mining efficiency (GH/s per Watt)"""
@@ -120,39 +169,27 @@ def calculate_profitability(hashrate_ghs: float, power_watts: float,
                           network_hashrate_ehs: float = 500) -> Dict[str, float]:
     """Calculate mining profitability estimates"""
     try:
-        # Convert units
-        hashrate_hs = hashrate_ghs * 1e9  # Convert to H/s
-        network_hashrate_hs = network_hashrate_ehs * 1e18  # Convert to H/s
-        
-        # Bitcoin mining calculations (simplified)
-        blocks_per_day = 144  # Average blocks per day
-        btc_per_block = 6.25  # Current block reward
-        daily_btc_reward = blocks_per_day * btc_per_block
-        
-        # Calculate share of network hashrate
-        hashrate_share = hashrate_hs / network_hashrate_hs
+        # Share of network hashrate (GH/s over EH/s, so scale the network by 1e9)
+        hashrate_share = hashrate_ghs / (network_hashrate_ehs * 1e9)
         
         # Daily earnings
-        daily_btc_earned = daily_btc_reward * hashrate_share
+        daily_btc_earned = _DAILY_BTC_REWARD * hashrate_share
         daily_revenue = daily_btc_earned * btc_price
         
-        # Daily costs
-        daily_power_kwh = (power_watts / 1000) * 24
-        daily_electricity_cost = daily_power_kwh * electricity_cost
+        # Daily costs (W -> kWh per day)
+        daily_electricity_cost = power_watts * 0.024 * electricity_cost
         
         # Profit calculations
         daily_profit = daily_revenue - daily_electricity_cost
-        monthly_profit = daily_profit * 30
-        yearly_profit = daily_profit * 365
         
         return {
             'daily_btc': daily_btc_earned,
             'daily_revenue': daily_revenue,
             'daily_cost': daily_electricity_cost,
             'daily_profit': daily_profit,
-            'monthly_profit': monthly_profit,
-            'yearly_profit': yearly_profit,
-            'roi_days': abs(daily_profit) if daily_profit != 0 else 0,
+            'monthly_profit': daily_profit * 30,
+            'yearly_profit': daily_profit * 365,
+            'roi_days': abs(daily_profit),
             'breakeven_btc_price': daily_electricity_cost / daily_btc_earned if daily_btc_earned > 0 else 0
         }
     
@@ -168,9 +205,33 @@ def calculate_profitability(hashrate_ghs: float, power_watts: float,
             'breakeven_btc_price': 0
         }
 
-def calculate_statistics(values: List[float]) -> Dict[str, float]:
-    """Calculate statistical measures for a list of values"""
-    if not values:
+if njit is not None:
+    @njit
+    def _stats_kernel(a):
+        """Min, max, mean and sum of squared deviations of a non-empty float64 array"""
+        n = a.shape[0]
+        total = 0.0
+        min_val = a[0]
+        max_val = a[0]
+        for i in range(n):
+            x = a[i]
+            total += x
+            if x < min_val:
+                min_val = x
+            if x > max_val:
+                max_val = x
+        mean = total / n
+        sq_dev = 0.0
+        for i in range(n):
+            d = a[i] - mean
+            sq_dev += d * d
+        return min_val, max_val, mean, sq_dev
+else:
+    _stats_kernel = None
+
+def calculate_statistics(values: Union[List[float], np.ndarray]) -> Dict[str, float]:
+    """Calculate statistical measures for a list or array of values"""
+    if len(values) == 0:
         return {
             'count': 0,
             'min': 0,
@@ -181,22 +242,25 @@ def calculate_statistics(values: List[float]) -> Dict[str, float]:
             'variance': 0
         }
     
-    count = len(values)
-    min_val = min(values)
-    max_val = max(values)
-    mean = sum(values) / count
-    
-    # Calculate median
-    sorted_values = sorted(values)
-    if count % 2 == 0:
-        median = (sorted_values[count // 2 - 1] + sorted_values[count // 2]) / 2
+    if _stats_kernel is not None and isinstance(values, np.ndarray):
+        # Telemetry windows arrive as arrays; reduce them in one compiled pass
+        arr = np.ascontiguousarray(values, dtype=np.float64)
+        count = arr.size
+        min_val, max_val, mean, sq_dev = _stats_kernel(arr)
+        sample_var = sq_dev / (count - 1) if count > 1 else 0
     else:
-        median = sorted_values[count // 2]
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        count = arr.size
+        min_val = float(arr.min())
+        max_val = float(arr.max())
+        mean = float(arr.mean())
+        sample_var = float(arr.var(ddof=1)) if count > 1 else 0
+    median = float(np.median(arr))
     
-    # Calculate standard deviation and variance
+    # Sample variance and standard deviation
     if count > 1:
-        variance = sum((x - mean) ** 2 for x in values) / (count - 1)
-        std_dev = variance ** 0.5
+        variance = float(sample_var)
+        std_dev = math.sqrt(variance)
     else:
         variance = 0
         std_dev = 0
@@ -211,51 +275,70 @@ def calculate_statistics(values: List[float]) -> Dict[str, float]:
         'variance': variance
     }
 
+def _probe_http_port(ip: str) -> Optional[str]:
+    """Return the IP if something accepts TCP connections on port 80"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(0.1)
+        return ip if sock.connect_ex((ip, 80)) == 0 else None
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+def _verify_bitaxe(ip: str) -> Optional[str]:
+    """Return the IP if its system info endpoint looks like a Bitaxe"""
+    try:
+        response = _HTTP.get(f"http://{ip}/api/system/info", timeout=2)
+        if response.status_code == 200:
+            data = response.json()
+            if 'ASICModel' in data or 'version' in data:
+                return ip
+    except Exception:
+        pass
+    return None
+
 def detect_device_network(ip_range: str = "192.168.1") -> List[str]:
     """Scan network for Bitaxe devices"""
     devices = []
     
     try:
-        for i in range(1, 255):
-            ip = f"{ip_range}.{i}"
-            
+        # Also validates ip_range; a malformed prefix raises and is logged below
+        network = ipaddress.IPv4Network(f"{ip_range}.0/24")
+        ips = [str(host) for host in network.hosts()]
+        
+        # Probes are I/O-bound, so the sweep runs them concurrently
+        with ThreadPoolExecutor(max_workers=64, thread_name_prefix="net-scan") as pool:
             # Quick port scan for typical Bitaxe ports
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(0.1)
-            
-            result = sock.connect_ex((ip, 80))
-            if result == 0:
-                # Check if it's actually a Bitaxe by trying to connect
-                try:
-                    import requests
-                    response = requests.get(f"http://{ip}/api/system/info", timeout=2)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'ASICModel' in data or 'version' in data:
-                            devices.append(ip)
-                except:
-                    pass
+            open_ips = [ip for ip in pool.map(_probe_http_port, ips) if ip]
             
-            sock.close()
+            # Check if it's actually a Bitaxe by querying its API
+            devices = [ip for ip in pool.map(_verify_bitaxe, open_ips) if ip]
     
     except Exception as e:
         logging.error(f"Error scanning network: {e}")
     
     return devices
 
+@lru_cache(maxsize=1)
+def _system_info_cached() -> Dict[str, Any]:
+    """Collect system information; it cannot change while the process runs"""
+    return {
+        'platform': platform.platform(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'version': platform.version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python_version': platform.python_version(),
+        'hostname': socket.gethostname()
+    }
+
 def get_system_info() -> Dict[str, Any]:
     """Get system information"""
     try:
-        return {
-            'platform': platform.platform(),
-            'system': platform.system(),
-            'release': platform.release(),
-            'version': platform.version(),
-            'machine': platform.machine(),
-            'processor': platform.processor(),
-            'python_version': platform.python_version(),
-            'hostname': socket.gethostname()
-        }
+        # Copy so callers can't modify the cached dict
+        return dict(_system_info_cached())
     except Exception as e:
         logging.error(f"Error getting system info: {e}")
         return {}
@@ -282,8 +365,7 @@ def backup_config(config_file: str, backup_dir: str = "backups") -> bool:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = backup_path / f"config_backup_{timestamp}.json"
         
-        with open(config_path, 'r') as src, open(backup_file, 'w') as dst:
-            dst.write(src.read())
+        shutil.copyfile(config_path, backup_file)
         
         logging.info(f"Config backed up to {backup_file}")
         return True
@@ -301,8 +383,7 @@ def restore_config(backup_file: str, config_file: str = "config.json") -> bool:
         if not backup_path.exists():
             return False
         
-        with open(backup_path, 'r') as src, open(config_path, 'w') as dst:
-            dst.write(src.read())
+        shutil.copyfile(backup_path, config_path)
         
         logging.info(f"Config restored from {backup_file}")
         return True
@@ -318,16 +399,22 @@ def cleanup_logs(log_file: str = "bitaxe_monitor.log", max_size_mb: int = 10) ->
         if not log_path.exists():
             return False
         
-        file_size_mb = log_path.stat().st_size / (1024 * 1024)
+        file_size = log_path.stat().st_size
+        file_size_mb = file_size / (1024 * 1024)
         
         if file_size_mb > max_size_mb:
-            # Keep only the last 50% of the file
-            with open(log_path, 'r') as f:
-                lines = f.readlines()
-            
-            keep_lines = len(lines) // 2
-            with open(log_path, 'w') as f:
-                f.writelines(lines[-keep_lines:])
+            # Keep roughly the last 50% of the file, starting at a line boundary. The log is
+            # rewritten in place rather than replaced: the logging handler keeps it open, so
+            # os.replace fails on Windows and leaves the handler writing to an unlinked file elsewhere
+            with tempfile.TemporaryFile(dir=log_path.parent) as tmp:
+                with open(log_path, 'rb') as src:
+                    src.seek(file_size // 2)
+                    src.readline()
+                    shutil.copyfileobj(src, tmp)
+                tmp.seek(0)
+                with open(log_path, 'r+b') as dst:
+                    shutil.copyfileobj(tmp, dst)
+                    dst.truncate()
             
             logging.info(f"Log file cleaned up: reduced from {file_size_mb:.1f}MB")
             return True
@@ -338,34 +425,26 @@ def cleanup_logs(log_file: str = "bitaxe_monitor.log", max_size_mb: int = 10) ->
         logging.error(f"Error cleaning up logs: {e}")
         return False
 
-def generate_device_id(ip_address: str) -> str:
-    """Generate unique device ID based on IP address"""
-    return hashlib.md5(ip_address.encode()).hexdigest()[:8]
+def generate_device_id(ip_address: str, legacy: bool = False) -> str:
+    """Generate unique device ID based on IP address (legacy=True gives the old MD5-based ID)"""
+    if legacy:
+        return hashlib.md5(ip_address.encode()).hexdigest()[:8]
+    return hashlib.blake2b(ip_address.encode(), digest_size=4).hexdigest()
 
 def parse_pool_url(url: str) -> Dict[str, str]:
     """Parse mining pool URL into components"""
     try:
-        # Basic URL parsing for stratum URLs
-        if url.startswith('stratum+tcp://'):
-            url = url[14:]  # Remove stratum+tcp://
-        elif url.startswith('stratum://'):
-            url = url[10:]  # Remove stratum://
-        
-        if ':' in url:
-            host, port = url.split(':', 1)
-            return {
-                'protocol': 'stratum',
-                'host': host,
-                'port': port,
-                'full_url': f"stratum+tcp://{host}:{port}"
-            }
-        else:
-            return {
-                'protocol': 'stratum',
-                'host': url,
-                'port': '4444',  # Default stratum port
-                'full_url': f"stratum+tcp://{url}:4444"
-            }
+        # Bare host[:port] values are treated as stratum+tcp
+        parts = urlsplit(url if '://' in url else f"stratum+tcp://{url}")
+        host = parts.hostname or ''
+        port = str(parts.port or 4444)  # Default stratum port
+        netloc_host = f"[{host}]" if ':' in host else host
+        return {
+            'protocol': 'stratum',
+            'host': host,
+            'port': port,
+            'full_url': f"stratum+tcp://{netloc_host}:{port}"
+        }
     
     except Exception as e:
         logging.error(f"Error parsing pool URL: {e}")
@@ -378,41 +457,32 @@ def parse_pool_url(url: str) -> Dict[str, str]:
 
 def format_bytes(bytes_val: int) -> str:
     """Format bytes in human readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_val < 1024.0:
-            return f"{bytes_val:.1f} {unit}"
-        bytes_val /= 1024.0
-    return f"{bytes_val:.1f} PB"
+    divisor, unit = _BYTES_UNITS[bisect_right(_BYTES_THRESHOLDS, bytes_val)]
+    return "%.1f %s" % (bytes_val / divisor, unit)
 
 def get_local_ip() -> str:
-    """Get local IP address"""
+    """Get local IP address, cached for `_LOCAL_IP_TTL` seconds"""
+    global _local_ip_cache
+    now = time.monotonic()
+    if _local_ip_cache is not None and now - _local_ip_cache[0] < _LOCAL_IP_TTL:
+        return _local_ip_cache[1]
     try:
         # Connect to a remote address to determine local IP
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("8.8.8.8", 80))
-            return s.getsockname()[0]
+            ip = s.getsockname()[0]
     except Exception:
+        # Not cached, so the lookup is retried once the network is up
         return "127.0.0.1"
+    _local_ip_cache = (now, ip)
+    return ip
 
-def ping_host(host: str, timeout: int = 3) -> bool:
-    """Ping a host to check connectivity"""
+def ping_host(host: str, timeout: int = 3, port: int = 80) -> bool:
+    """Check connectivity to a host with a TCP connect to its web port"""
     try:
-        if platform.system().lower() == "windows":
-            cmd = f"ping -n 1 -w {timeout * 1000} {host}"
-        else:
-            cmd = f"ping -c 1 -W {timeout} {host}"
-        
-        result = subprocess.run(
-            cmd.split(),
-            capture_output=True,
-            text=True,
-            timeout=timeout + 1
-        )
-        
-        return result.returncode == 0
-    
-    except Exception as e:
-        logging.error(f"Error pinging {host}: {e}")
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
         return False
 
 def safe_float(value: Any, default: float = 0.0) -> float:
@@ -440,15 +510,14 @@ def create_alert_sound():
     try:
         if platform.system().lower() == "windows":
             import winsound
-            winsound.Beep(1000, 500)  # 1000 Hz for 500ms
+            # Play asynchronously so the calling thread isn't blocked like with Beep()
+            winsound.PlaySound('SystemExclamation', winsound.SND_ALIAS | winsound.SND_ASYNC)
     except ImportError:
         pass  # winsound not available on non-Windows systems
 
 def export_data_csv(data: List[Dict[str, Any]], filename: str, fields: List[str] = None) -> bool:
     """Export data to CSV file"""
     try:
-        import csv
-        
         if not data:
             return False
         
@@ -456,13 +525,11 @@ def export_data_csv(data: List[Dict[str, Any]], filename: str, fields: List[str]
             fields = list(data[0].keys())
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fields)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(fields)
             
-            for row in data:
-                # Filter row to only include specified fields
-                filtered_row = {field: row.get(field, '') for field in fields}
-                writer.writerow(filtered_row)
+            # Filter each row to only the specified fields, in header order
+            writer.writerows(tuple(row.get(field, '') for field in fields) for row in data)
         
         logging.info(f"Data exported to {filename}")
         return True
@@ -471,16 +538,15 @@ def export_data_csv(data: List[Dict[str, Any]], filename: str, fields: List[str]
         logging.error(f"Error exporting data to CSV: {e}")
         return False
 
+def iter_data_csv(filename: str) -> Iterator[Dict[str, str]]:
+    """Yield rows from a CSV file one at a time"""
+    with open(filename, 'r', encoding='utf-8', newline='') as csvfile:
+        yield from csv.DictReader(csvfile)
+
 def import_data_csv(filename: str) -> List[Dict[str, Any]]:
     """Import data from CSV file"""
     try:
-        import csv
-        
-        data = []
-        with open(filename, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data.append(dict(row))
+        data = list(iter_data_csv(filename))
         
         logging.info(f"Data imported from {filename}: {len(data)} rows")
         return data
@@ -492,16 +558,19 @@ def import_data_csv(filename: str) -> List[Dict[str, Any]]:
 class PerformanceMonitor:
     """Monitor application performance"""
     
+    METRICS = (
+        'api_calls',
+        'api_errors',
+        'database_operations',
+        'database_errors',
+        'notifications_sent',
+        'optimization_runs'
+    )
+    
     def __init__(self):
         self.start_time = datetime.now()
-        self.metrics = {
-            'api_calls': 0,
-            'api_errors': 0,
-            'database_operations': 0,
-            'database_errors': 0,
-            'notifications_sent': 0,
-            'optimization_runs': 0
-        }
+        self._start_ns = time.monotonic_ns()
+        self.metrics = Counter(dict.fromkeys(self.METRICS, 0))
     
     def increment_metric(self, metric: str):
         """Increment a performance metric"""
@@ -510,31 +579,33 @@ class PerformanceMonitor:
     
     def get_uptime(self) -> timedelta:
         """Get application uptime"""
-        return datetime.now() - self.start_time
+        return timedelta(microseconds=(time.monotonic_ns() - self._start_ns) // 1000)
+    
+    @staticmethod
+    def _success_rate(total: int, errors: int) -> float:
+        """Percentage of operations that did not error; 100 when nothing has run yet"""
+        return 100.0 * (total - errors) / total if total else 100.0
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get all performance metrics"""
-        uptime = self.get_uptime()
+        metrics = self.metrics
+        uptime_seconds = self.get_uptime().total_seconds()
         
         return {
-            **self.metrics,
-            'uptime_seconds': uptime.total_seconds(),
-            'uptime_formatted': format_uptime(int(uptime.total_seconds())),
-            'api_success_rate': (
-                (self.metrics['api_calls'] - self.metrics['api_errors']) / 
-                max(self.metrics['api_calls'], 1) * 100
-            ),
-            'database_success_rate': (
-                (self.metrics['database_operations'] - self.metrics['database_errors']) / 
-                max(self.metrics['database_operations'], 1) * 100
+            **metrics,
+            'uptime_seconds': uptime_seconds,
+            'uptime_formatted': format_uptime(int(uptime_seconds)),
+            'api_success_rate': self._success_rate(metrics['api_calls'], metrics['api_errors']),
+            'database_success_rate': self._success_rate(
+                metrics['database_operations'], metrics['database_errors']
             )
         }
     
     def reset_metrics(self):
         """Reset all metrics"""
-        for key in self.metrics:
-            self.metrics[key] = 0
+        self.metrics = Counter(dict.fromkeys(self.METRICS, 0))
         self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
 
 # Global performance monitor instance
 performance_monitor = PerformanceMonitor()